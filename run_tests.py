@@ -6,30 +6,49 @@ Run all unit tests for the Uniswap V3 analysis project.
 import sys
 import unittest
 import os
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+START_DIR = 'tests'
+
+
+def run_test_file(file_name):
+    """Discover and run one test file; return its counts and report."""
+    suite = unittest.TestLoader().discover(START_DIR, pattern=file_name)
+    stream = StringIO()
+    result = unittest.TextTestRunner(stream=stream, verbosity=2).run(suite)
+    return result.testsRun, len(result.failures), len(result.errors), stream.getvalue()
+
+
 def main():
     """Run all tests."""
-    # Discover and run all tests
-    loader = unittest.TestLoader()
-    start_dir = 'tests'
-    suite = loader.discover(start_dir, pattern='test_*.py')
+    # Test files share no state: run each in a worker process, report in order
+    file_names = sorted(path.name for path in Path(START_DIR).glob('test_*.py'))
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(run_test_file, file_names))
+    
+    for file_name, (_, _, _, report) in zip(file_names, results):
+        print(f"\n{file_name}")
+        print(report, end='')
     
-    # Run tests with verbosity
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    tests_run = sum(result[0] for result in results)
+    failures = sum(result[1] for result in results)
+    errors = sum(result[2] for result in results)
+    successful = failures == 0 and errors == 0
     
     # Print summary
     print("\n" + "="*60)
     print("TEST SUMMARY")
     print("="*60)
-    print(f"Tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
+    print(f"Tests run: {tests_run}")
+    print(f"Failures: {failures}")
+    print(f"Errors: {errors}")
     
-    if result.wasSuccessful():
+    if successful:
         print("\n✅ All tests passed!")
     else:
         print("\n❌ Some tests failed.")
@@ -37,7 +56,7 @@ def main():
     print("="*60)
     
     # Exit with error code if tests failed
-    sys.exit(0 if result.wasSuccessful() else 1)
+    sys.exit(0 if successful else 1)
 
 
 if __name__ == '__main__':
@@ -86,6 +86,7 @@ async def benchmark_pool_state_fetching():
             except Exception as e:
                 print(f"    Error on block {block}: {str(e)[:50]}...")
         basic_time = time.time() - start_time
+        await basic_fetcher.close()
     except Exception as e:
         print(f"  ❌ Sequential test failed: {e}")
         basic_time = 0
@@ -112,6 +113,8 @@ async def benchmark_pool_state_fetching():
     cache_time = time.time() - cache_start
     cached_success = sum(1 for r in cached_results if not isinstance(r, Exception))
     print(f"  ✅ Cache test: {cached_success}/3 blocks in {cache_time:.2f}s")
+    
+    await optimized_fetcher.close()
 
 
 async def benchmark_event_fetching():
@@ -166,6 +169,8 @@ async def benchmark_event_fetching():
     print(f"  Total time: {small_chunk_time:.2f}s")
     print(f"  Events per second: {len(events_small)/small_chunk_time:.1f}")
     
+    await optimized_fetcher.close()
+    
     # Calculate improvement
     improvement = (small_chunk_time / optimized_time - 1) * 100
     print(f"\n🚀 Large chunk improvement: {improvement:.1f}% faster")
@@ -10,6 +10,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import click
 import asyncio
 import logging
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
@@ -59,7 +61,7 @@ def analyze(ctx, pool: str, analysis: str, cache: bool, output_dir: Optional[str
     
     # Override output directory if specified
     if output_dir:
-        config.output.directory = output_dir
+        config = replace(config, output=replace(config.output, directory=output_dir))
     
     # Run analysis
     asyncio.run(_run_analysis(
@@ -189,6 +191,7 @@ async def _run_analysis(config, pool_config, analysis_config, use_cache: bool):
             logger.info(f"Performance: {operation} - {duration:.2f}s{status}")
     
     perf = PerformanceLogger()
+    data_fetcher = None
     
     try:
         # Initialize components with optimized settings
@@ -280,27 +283,30 @@ async def _run_analysis(config, pool_config, analysis_config, use_cache: bool):
         
         # Generate visualizations
         if 'png' in config.output.formats:
-            visualizer.plot_liquidity_distribution(
-                liquidity_distribution,
-                position,
-                analysis_config.position.tick_lower,
-                analysis_config.position.tick_upper,
-                pool_data_start.tick,  # Add current tick
-                str(output_dir / "liquidity_distribution.png")
-            )
-            
-            visualizer.plot_fee_accumulation(
-                results['fee_by_tick'],
-                analysis_config.position.tick_lower - 10,
-                analysis_config.position.tick_upper + 10,
-                eth_price_end,  # Add ETH price for conversion
-                str(output_dir / "fee_accumulation.png")
-            )
-            
-            # Generate position value chart
-            visualizer.plot_position_value_chart(
-                results,
-                str(output_dir / "position_value.png")
+            # The three charts are independent; render them in parallel
+            visualizer.render_all(
+                partial(
+                    Visualizer.plot_liquidity_distribution,
+                    liquidity_distribution=liquidity_distribution,
+                    position=position,
+                    tick_lower=analysis_config.position.tick_lower,
+                    tick_upper=analysis_config.position.tick_upper,
+                    current_tick=pool_data_start.tick,
+                    output_path=str(output_dir / "liquidity_distribution.png")
+                ),
+                partial(
+                    Visualizer.plot_fee_accumulation,
+                    fee_by_tick=results['fee_by_tick'],
+                    tick_lower=analysis_config.position.tick_lower - 10,
+                    tick_upper=analysis_config.position.tick_upper + 10,
+                    eth_price=eth_price_end,  # ETH price for conversion
+                    output_path=str(output_dir / "fee_accumulation.png")
+                ),
+                partial(
+                    Visualizer.plot_position_value_chart,
+                    analysis_results=results,
+                    output_path=str(output_dir / "position_value.png")
+                ),
             )
         
         if 'html' in config.output.formats:
@@ -317,6 +323,9 @@ async def _run_analysis(config, pool_config, analysis_config, use_cache: bool):
     except Exception as e:
         logger.error(f"Analysis failed: {str(e)}")
         raise
+    finally:
+        if data_fetcher is not None:
+            await data_fetcher.close()
 
 
 async def _show_pool_info(config, pool_config, block_number: Optional[int]):
@@ -338,7 +347,10 @@ async def _show_pool_info(config, pool_config, block_number: Optional[int]):
         block_number = "latest"
     
     # Fetch pool state
-    pool_state = await data_fetcher.get_pool_state(pool_config.address, block_number)
+    try:
+        pool_state = await data_fetcher.get_pool_state(pool_config.address, block_number)
+    finally:
+        await data_fetcher.close()
     
     click.echo(f"\nPool: {pool_config.name}")
     click.echo(f"Address: {pool_config.address}")
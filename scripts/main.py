@@ -108,7 +108,7 @@ async def main():
         
         data_fetcher = DataFetcher(
             rpc_url=rpc_url,
-            max_workers=20,              # Optimized thread pool size
+            max_workers=20,              # HTTP connection pool size
             max_concurrent_requests=10,  # Rate limiting
             cache=cache                  # Enable caching
         )
@@ -270,6 +270,8 @@ async def main():
         
         perf.record("Visualization Generation", time.time() - viz_start)
         
+        await data_fetcher.close()
+        
         print("\n✅ Analysis complete! Results saved to output/")
         
     except Exception as e:
@@ -1,5 +1,5 @@
 """Analysis module for position calculations and fee estimation."""
 
-from .position_analyzer import PositionAnalyzer
+from .position_analyzer import PositionAnalyzer, FeeByTick, total_fees, swap_columns
 
-__all__ = ['PositionAnalyzer'] 
\ No newline at end of file
+__all__ = ['PositionAnalyzer', 'FeeByTick', 'total_fees', 'swap_columns'] 
\ No newline at end of file
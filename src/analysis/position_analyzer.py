@@ -2,8 +2,10 @@
 Analysis module for calculating impermanent loss, fees, and PnL.
 """
 
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional, Union
+from collections.abc import Mapping
 from dataclasses import dataclass
+from itertools import repeat
 import math
 import hashlib
 import json
@@ -13,6 +15,136 @@ from src.uniswap import UniswapV3Calculator, Position
 from src.blockchain import PoolState, SwapEvent
 from src.core.interfaces import ICacheProvider
 
+# Pool liquidity by tick: a {tick: liquidity} dict, or a dense
+# (base_tick, liquidities) pair where liquidities[i] is at base_tick + i
+LiquidityDistribution = Union[Dict[int, int], Tuple[int, np.ndarray]]
+
+# Swaps as a list of events, or as the (block_numbers, ticks, amounts0, amounts1)
+# arrays from swap_columns, built once and shared across positions
+SwapData = Union[List[SwapEvent], Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+
+
+def swap_columns(swap_events: List[SwapEvent]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Swap block numbers, ticks and absolute amounts as parallel arrays.
+    
+    Pass the result to estimate_fees_from_swaps in place of the event list
+    when sweeping many positions over the same swaps, so the events are
+    read once.
+    """
+    n_swaps = len(swap_events)
+    block_numbers = np.fromiter((swap.block_number for swap in swap_events), dtype=np.int64, count=n_swaps)
+    ticks = np.fromiter((swap.tick for swap in swap_events), dtype=np.int64, count=n_swaps)
+    amounts0 = np.fromiter((abs(swap.amount0) for swap in swap_events), dtype=np.float64, count=n_swaps)
+    amounts1 = np.fromiter((abs(swap.amount1) for swap in swap_events), dtype=np.float64, count=n_swaps)
+    return block_numbers, ticks, amounts0, amounts1
+
+
+def _liquidity_at(liquidity_distribution: LiquidityDistribution, ticks: np.ndarray) -> np.ndarray:
+    """Look up pool liquidity for each tick; ticks without data count as 1.
+    
+    Dict lookups come back as float64, which also holds uint128 liquidity
+    that would overflow int64; callers only divide by it.
+    """
+    if isinstance(liquidity_distribution, tuple):
+        base_tick, liquidities = liquidity_distribution
+        offsets = ticks - base_tick
+        inside = (offsets >= 0) & (offsets < len(liquidities))
+        result = np.ones(len(ticks), dtype=liquidities.dtype)
+        result[inside] = liquidities[offsets[inside]]
+        return result
+    return np.fromiter(
+        map(liquidity_distribution.get, ticks.tolist(), repeat(1)),
+        dtype=np.float64, count=len(ticks)
+    )
+
+
+def _distribute_fees(ticks: np.ndarray, fees0: np.ndarray, fees1: np.ndarray,
+                     tick_lower: int, tick_upper: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Spread each swap's fees evenly over the ticks it crossed.
+    
+    A swap crosses the ticks between the previous swap's tick and its own
+    (the first swap only its own tick), clipped to [tick_lower, tick_upper].
+    Each swap adds its per-tick rate at the start of its range and removes
+    it one past the end; a prefix sum then gives every tick's total.
+    
+    Args:
+        ticks: Tick after each swap, in swap order
+        fees0: Token0 fee of each swap
+        fees1: Token1 fee of each swap
+        tick_lower: First tick of the range
+        tick_upper: Last tick of the range
+        
+    Returns:
+        (token0 fees, token1 fees) per tick of the range; ticks no swap
+        reached are exactly zero
+    """
+    n_ticks = tick_upper - tick_lower + 1
+    prev_ticks = np.concatenate((ticks[:1], ticks[:-1]))
+    starts = np.maximum(np.minimum(prev_ticks, ticks), tick_lower)
+    ends = np.minimum(np.maximum(prev_ticks, ticks), tick_upper)
+    
+    # Only swaps whose range overlaps ours
+    hit = starts <= ends
+    first = starts[hit] - tick_lower
+    past_last = ends[hit] - tick_lower + 1
+    ticks_crossed = past_last - first
+    
+    def _per_tick(weights=None):
+        diff = (np.bincount(first, weights, minlength=n_ticks + 1)
+                - np.bincount(past_last, weights, minlength=n_ticks + 1))
+        return np.cumsum(diff[:-1])
+    
+    crossed = _per_tick() > 0
+    rates0 = np.where(crossed, _per_tick(fees0[hit] / ticks_crossed), 0.0)
+    rates1 = np.where(crossed, _per_tick(fees1[hit] / ticks_crossed), 0.0)
+    return rates0, rates1
+
+
+class FeeByTick(Mapping):
+    """Read-only {tick: (usdc_fees, weth_fees)} view over per-tick fee arrays.
+    
+    Ticks run from base_tick to base_tick + len(fees0) - 1; pairs are built
+    on access instead of being stored for every tick.
+    """
+    
+    __slots__ = ('base_tick', 'fees0', 'fees1')
+    
+    def __init__(self, base_tick: int, fees0: np.ndarray, fees1: np.ndarray):
+        self.base_tick = base_tick
+        self.fees0 = fees0
+        self.fees1 = fees1
+    
+    def __getitem__(self, tick: int) -> Tuple[float, float]:
+        if not isinstance(tick, (int, np.integer)):
+            raise KeyError(tick)
+        offset = tick - self.base_tick
+        if not 0 <= offset < len(self.fees0):
+            raise KeyError(tick)
+        return float(self.fees0[offset]), float(self.fees1[offset])
+    
+    def __iter__(self):
+        return iter(range(self.base_tick, self.base_tick + len(self.fees0)))
+    
+    def __len__(self) -> int:
+        return len(self.fees0)
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+def total_fees(fee_by_tick: Mapping) -> Tuple[float, float]:
+    """Sum (usdc_fees, weth_fees) over all ticks in one pass.
+    
+    Sums are correctly rounded (math.fsum) however many ticks there are;
+    a FeeByTick is summed straight from its arrays.
+    """
+    if isinstance(fee_by_tick, FeeByTick):
+        return math.fsum(fee_by_tick.fees0.tolist()), math.fsum(fee_by_tick.fees1.tolist())
+    if not fee_by_tick:
+        return 0.0, 0.0
+    fees0, fees1 = zip(*fee_by_tick.values())
+    return math.fsum(fees0), math.fsum(fees1)
+
 
 class PositionAnalyzer:
     """Analyzes Uniswap V3 positions for IL, fees, and PnL."""
@@ -62,6 +194,38 @@ class PositionAnalyzer:
         
         return il_amount, il_percentage
     
+    @staticmethod
+    def calculate_impermanent_loss_batch(
+        initial_usdc: np.ndarray,
+        initial_weth: np.ndarray,
+        final_usdc: np.ndarray,
+        final_weth: np.ndarray,
+        initial_eth_price: np.ndarray,
+        final_eth_price: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate impermanent loss for many scenarios at once.
+        
+        Same formula as calculate_impermanent_loss, elementwise over arrays
+        (scalars broadcast). Returns (IL in USDC, IL percentage) arrays;
+        the percentage is 0 where the initial value is not positive.
+        """
+        initial_usdc = np.asarray(initial_usdc, dtype=np.float64)
+        initial_weth = np.asarray(initial_weth, dtype=np.float64)
+        final_eth_price = np.asarray(final_eth_price, dtype=np.float64)
+        
+        initial_value = initial_usdc + initial_weth * initial_eth_price
+        hodl_value = initial_usdc + initial_weth * final_eth_price
+        final_value = final_usdc + final_weth * final_eth_price
+        
+        il_amount = hodl_value - final_value
+        il_percentage = np.divide(
+            il_amount, initial_value,
+            out=np.zeros(np.shape(il_amount)), where=initial_value > 0
+        ) * 100
+        
+        return il_amount, il_percentage
+    
     @staticmethod
     def calculate_impermanent_loss_full_range(
         initial_price: float,
@@ -90,29 +254,36 @@ class PositionAnalyzer:
         # Convert to percentage
         return il_decimal * 100
     
-    def _get_fee_cache_key(self, position: Position, swap_events: List[SwapEvent], pool_fee: int) -> str:
+    def _get_fee_cache_key(self, position: Position, swap_events: SwapData, pool_fee: int) -> str:
         """Generate a cache key for fee calculations."""
         # Create a hash of the position and swap events
         position_hash = f"{position.liquidity}_{position.tick_lower}_{position.tick_upper}"
         
         # Hash swap events (use first/last block and count for efficiency)
-        if swap_events:
+        if isinstance(swap_events, tuple):
+            block_numbers = swap_events[0]
+            swap_hash = (f"{block_numbers[0]}_{block_numbers[-1]}_{len(block_numbers)}"
+                         if len(block_numbers) else "no_swaps")
+        elif swap_events:
             swap_hash = f"{swap_events[0].block_number}_{swap_events[-1].block_number}_{len(swap_events)}"
         else:
             swap_hash = "no_swaps"
         
         return f"fees:{position_hash}:{swap_hash}:{pool_fee}"
-
+    
     async def estimate_fees_from_swaps(
         self,
         position: Position,
-        swap_events: List[SwapEvent],
-        liquidity_distribution: Dict[int, int],
+        swap_events: SwapData,
+        liquidity_distribution: LiquidityDistribution,
         pool_fee: int
-    ) -> Dict[int, Tuple[float, float]]:
+    ) -> FeeByTick:
         """
         Estimate fees earned from swap events.
-        Returns fees by tick as {tick: (usdc_fees, weth_fees)}.
+        Swaps may be a list of events or the arrays from swap_columns.
+        Pool liquidity may be a {tick: liquidity} dict or a dense
+        (base_tick, liquidities) array pair, indexed by tick offset.
+        Returns a read-only FeeByTick mapping of {tick: (usdc_fees, weth_fees)}.
         """
         # Check cache first
         if self.cache:
@@ -121,61 +292,43 @@ class PositionAnalyzer:
             if cached_fees:
                 return cached_fees
         
-        fee_by_tick = {}
-        
-        # Initialize fee accumulation for our tick range - vectorized
-        tick_range = np.arange(position.tick_lower, position.tick_upper + 1)
-        fee_by_tick = {tick: (0.0, 0.0) for tick in tick_range}
-        
-        # Process each swap event
-        for i, swap in enumerate(swap_events):
-            # Determine tick range crossed by this swap
-            if i == 0:
-                prev_tick = swap.tick  # Assume starting at current tick
-            else:
-                prev_tick = swap_events[i-1].tick
-                
-            current_tick = swap.tick
-            
-            # Calculate fee for this swap
-            # Fee rate is pool_fee / 1e6 (e.g., 500 / 1e6 = 0.05%)
-            fee_rate = pool_fee / 1e6
-            
-            # Fees in terms of traded amounts
-            fee0 = abs(swap.amount0) * fee_rate / 10**6  # USDC
-            fee1 = abs(swap.amount1) * fee_rate / 10**18  # WETH
-            
-            # Distribute fees across ticks that were crossed
-            tick_start = min(prev_tick, current_tick)
-            tick_end = max(prev_tick, current_tick)
-            
-            # Only consider ticks within our position range
-            tick_start = max(tick_start, position.tick_lower)
-            tick_end = min(tick_end, position.tick_upper)
-            
-            if tick_start <= tick_end:
-                ticks_crossed = tick_end - tick_start + 1
-                
-                # Vectorized fee distribution
-                tick_array = np.arange(tick_start, tick_end + 1)
-                valid_ticks = tick_array[np.isin(tick_array, list(fee_by_tick.keys()))]
-                
-                if len(valid_ticks) > 0:
-                    # Calculate liquidity shares for all ticks at once
-                    total_liquidities = np.array([liquidity_distribution.get(t, 1) for t in valid_ticks])
-                    our_shares = np.where(total_liquidities > 0, position.liquidity / total_liquidities, 0)
-                    
-                    # Distribute fees
-                    tick_fee0_array = (fee0 / ticks_crossed) * our_shares
-                    tick_fee1_array = (fee1 / ticks_crossed) * our_shares
-                    
-                    # Update fee_by_tick
-                    for i, tick in enumerate(valid_ticks):
-                        old_fees = fee_by_tick[tick]
-                        fee_by_tick[tick] = (
-                            old_fees[0] + tick_fee0_array[i],
-                            old_fees[1] + tick_fee1_array[i]
-                        )
+        tick_lower, tick_upper = position.tick_lower, position.tick_upper
+        n_ticks = tick_upper - tick_lower + 1
+        if n_ticks <= 0:
+            return FeeByTick(tick_lower, np.zeros(0), np.zeros(0))
+        
+        # Our share of each tick's liquidity, looked up once for the range
+        total_liquidities = _liquidity_at(
+            liquidity_distribution, np.arange(tick_lower, tick_upper + 1)
+        )
+        min_liquidity, max_liquidity = total_liquidities.min(), total_liquidities.max()
+        if min_liquidity == max_liquidity:
+            # Uniform liquidity across the range: one scalar share for every tick
+            our_shares = float(position.liquidity) / min_liquidity if min_liquidity > 0 else 0.0
+        else:
+            our_shares = np.divide(
+                float(position.liquidity), total_liquidities,
+                out=np.zeros(n_ticks), where=total_liquidities > 0
+            )
+        
+        # Fee rate is pool_fee / 1e6 (e.g., 500 / 1e6 = 0.05%)
+        fee_rate = pool_fee / 1e6
+        
+        # Swap fields as parallel arrays
+        if not isinstance(swap_events, tuple):
+            swap_events = swap_columns(swap_events)
+        _, ticks, amounts0, amounts1 = swap_events
+        
+        # Fees in terms of traded amounts; rate and decimals folded into one scale
+        swap_fees0 = amounts0 * (fee_rate / 10**6)  # USDC
+        swap_fees1 = amounts1 * (fee_rate / 10**18)  # WETH
+        
+        # Distribute fees across ticks that were crossed, then take our share
+        rates0, rates1 = _distribute_fees(ticks, swap_fees0, swap_fees1, tick_lower, tick_upper)
+        fees0 = rates0 * our_shares
+        fees1 = rates1 * our_shares
+        
+        fee_by_tick = FeeByTick(tick_lower, fees0, fees1)
         
         # Cache the result
         if self.cache:
@@ -188,7 +341,7 @@ class PositionAnalyzer:
         position: Position,
         pool_state_start: PoolState,
         pool_state_end: PoolState,
-        liquidity_distribution: Dict[int, int],
+        liquidity_distribution: LiquidityDistribution,
         swap_events: List[SwapEvent],
         eth_price_start: float,
         eth_price_end: float
@@ -221,11 +374,7 @@ class PositionAnalyzer:
         )
         
         # Sum total fees
-        total_fees_usdc = 0
-        total_fees_weth = 0
-        for fees in fee_by_tick.values():
-            total_fees_usdc += fees[0]
-            total_fees_weth += fees[1]
+        total_fees_usdc, total_fees_weth = total_fees(fee_by_tick)
         
         # Calculate final values
         final_value_from_position = final_usdc + (final_weth * eth_price_end)
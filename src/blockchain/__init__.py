@@ -1,5 +1,11 @@
 """Blockchain interaction module for Ethereum and Uniswap data fetching."""
 
-from .data_fetcher import DataFetcher, PoolState, SwapEvent
+from .data_fetcher import (
+    DataFetcher, PoolState, SwapEvent,
+    SWAP_EVENT_COLUMNS, swap_events_to_frame, frame_to_swap_events
+)
 
-__all__ = ['DataFetcher', 'PoolState', 'SwapEvent'] 
\ No newline at end of file
+__all__ = [
+    'DataFetcher', 'PoolState', 'SwapEvent',
+    'SWAP_EVENT_COLUMNS', 'swap_events_to_frame', 'frame_to_swap_events'
+] 
\ No newline at end of file
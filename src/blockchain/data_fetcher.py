@@ -7,19 +7,48 @@ import json
 import asyncio
 import aiohttp
 from typing import Dict, List, Any, Optional, Tuple
-from decimal import Decimal
-from web3 import Web3
-from web3.contract import Contract
-from web3.providers.rpc import HTTPProvider
-from concurrent.futures import ThreadPoolExecutor
+from eth_abi import decode, encode
+from web3 import AsyncWeb3, Web3
+from web3.contract import AsyncContract
+from web3.providers.async_rpc import AsyncHTTPProvider
 import logging
+from operator import attrgetter, itemgetter
+from itertools import accumulate
 from dataclasses import dataclass
-from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
-import requests
+import pandas as pd
 from src.data.cache import FileCache, CacheKeyBuilder
 from src.core.interfaces import ICacheProvider
 
+# Optional: orjson decodes large JSON-RPC responses (eth_getLogs) in C
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 10^(18 - 6): WETH decimals minus USDC decimals
+USDC_WETH_DECIMALS_SCALE = 10 ** 12
+
+# Swap log chunk tuning: aim for this many logs per eth_getLogs response
+TARGET_LOGS_PER_CHUNK = 5000
+# Blocks fetched up front to estimate swap density for a pool not seen before
+DENSITY_PROBE_BLOCKS = 100
+# Smallest block range requested per chunk, however dense the pool
+MIN_CHUNK_SIZE = 10
+# Lower-cased fragments of the JSON-RPC errors nodes return when an
+# eth_getLogs range is over their block-range or result-count cap
+LOG_RANGE_ERROR_MARKERS = (
+    'query returned more than',
+    'block range',
+    'range too large',
+    'range is too large',
+    'response size exceeded',
+)
+
+# Multicall3: same address on mainnet and most EVM chains (mainnet block 14353601+)
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+# Tick reads packed into one Multicall3 eth_call, bounded to stay under node gas caps
+MULTICALL_BATCH_SIZE = 500
+
 # Uniswap V3 Pool ABI (minimal)
 POOL_ABI = json.loads('''[
     {
@@ -104,6 +133,43 @@ POOL_ABI = json.loads('''[
     }
 ]''')
 
+
+def _function_signature(entry: Dict[str, Any]) -> str:
+    """Build the canonical signature, e.g. ``ticks(int24)``, of an ABI function."""
+    return f"{entry['name']}({','.join(arg['type'] for arg in entry['inputs'])})"
+
+
+# Pool function selectors and argument/return types, derived once at import.
+# Used for raw eth_call on the hot path; POOL_ABI remains for event decoding.
+_POOL_FUNCTIONS = [entry for entry in POOL_ABI if entry['type'] == 'function']
+POOL_FN_SELECTORS = {
+    entry['name']: bytes(Web3.keccak(text=_function_signature(entry))[:4])
+    for entry in _POOL_FUNCTIONS
+}
+POOL_FN_INPUT_TYPES = {
+    entry['name']: [arg['type'] for arg in entry['inputs']] for entry in _POOL_FUNCTIONS
+}
+POOL_FN_OUTPUT_TYPES = {
+    entry['name']: [arg['type'] for arg in entry['outputs']] for entry in _POOL_FUNCTIONS
+}
+
+# tryAggregate(bool requireSuccess, (address target, bytes callData)[] calls)
+MULTICALL3_TRY_AGGREGATE = bytes(Web3.keccak(text='tryAggregate(bool,(address,bytes)[])')[:4])
+
+# RPC endpoints that answered a connectivity check in this process; later
+# fetchers for the same endpoint skip the check
+_verified_endpoints: set = set()
+
+# Pool functions read to build a PoolState, in PoolState field order
+POOL_STATE_FUNCTIONS = ('slot0', 'liquidity', 'fee', 'tickSpacing', 'token0', 'token1')
+
+
+def _decode_pool_result(name: str, raw: bytes) -> Any:
+    """Decode a pool function's return data: the single value, or a tuple."""
+    values = decode(POOL_FN_OUTPUT_TYPES[name], raw)
+    return values[0] if len(values) == 1 else values
+
+
 # ERC20 ABI (minimal)
 ERC20_ABI = json.loads('''[
     {
@@ -123,79 +189,198 @@ ERC20_ABI = json.loads('''[
 ]''')
 
 
+@dataclass(frozen=True, slots=True)
 class PoolState:
     """Represents the state of a Uniswap V3 pool at a specific block."""
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+    fee: int
+    tick_spacing: int
+    token0: str
+    token1: str
+    block_number: int
     
-    def __init__(self, 
-                 sqrt_price_x96: int,
-                 tick: int,
-                 liquidity: int,
-                 fee: int,
-                 tick_spacing: int,
-                 token0: str,
-                 token1: str,
-                 block_number: int):
-        self.sqrt_price_x96 = sqrt_price_x96
-        self.tick = tick
-        self.liquidity = liquidity
-        self.fee = fee
-        self.tick_spacing = tick_spacing
-        self.token0 = token0.lower()
-        self.token1 = token1.lower()
-        self.block_number = block_number
+    def __post_init__(self):
+        # Normalize token addresses; frozen dataclasses need object.__setattr__
+        object.__setattr__(self, 'token0', self.token0.lower())
+        object.__setattr__(self, 'token1', self.token1.lower())
 
 
+@dataclass(frozen=True, slots=True)
 class SwapEvent:
     """Represents a swap event in a Uniswap V3 pool."""
+    sender: str
+    recipient: str
+    amount0: int
+    amount1: int
+    sqrt_price_x96: int
+    liquidity: int
+    tick: int
+    block_number: int
+    transaction_hash: str
     
-    def __init__(self,
-                 sender: str,
-                 recipient: str,
-                 amount0: int,
-                 amount1: int,
-                 sqrt_price_x96: int,
-                 liquidity: int,
-                 tick: int,
-                 block_number: int,
-                 transaction_hash: str):
-        self.sender = sender
-        self.recipient = recipient
-        self.amount0 = amount0
-        self.amount1 = amount1
-        self.sqrt_price_x96 = sqrt_price_x96
-        self.liquidity = liquidity
-        self.tick = tick
-        self.block_number = block_number
-        self.transaction_hash = transaction_hash
-
-
-class OptimizedHTTPProvider(HTTPProvider):
-    """Optimized HTTP provider with connection pooling and retry logic."""
-    
-    def __init__(self, endpoint_uri: str, pool_connections: int = 20, pool_maxsize: int = 20, 
-                 max_retries: int = 3, backoff_factor: float = 0.1):
-        # Create session with connection pooling
-        session = requests.Session()
-        
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=backoff_factor,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "POST"]
-        )
+    @classmethod
+    def make(cls, amount0: int, amount1: int, tick: int, **overrides) -> 'SwapEvent':
+        """Build a swap from its amounts and tick; other fields default to placeholders."""
+        if overrides:
+            return cls(**{**_SWAP_EVENT_DEFAULTS, **overrides,
+                          'amount0': amount0, 'amount1': amount1, 'tick': tick})
+        return cls("0x0", "0x0", amount0, amount1, 0, 0, tick, 0, "")
+
+
+# Placeholder values for the SwapEvent fields make() does not take positionally
+_SWAP_EVENT_DEFAULTS = {
+    'sender': "0x0", 'recipient': "0x0", 'sqrt_price_x96': 0,
+    'liquidity': 0, 'block_number': 0, 'transaction_hash': ""
+}
+
+
+# Column layout of the swap events table, in SwapEvent field order
+SWAP_EVENT_COLUMNS = (
+    'sender', 'recipient', 'amount0', 'amount1', 'sqrt_price_x96',
+    'liquidity', 'tick', 'block_number', 'transaction_hash'
+)
+
+# Columns that always fit in int64; the rest (int256/uint160/uint128) stay as Python ints
+_SWAP_EVENT_INT64_COLUMNS = ('tick', 'block_number')
+
+_get_swap_event_fields = attrgetter(*SWAP_EVENT_COLUMNS)
+
+
+def swap_events_to_frame(events: List[SwapEvent]) -> pd.DataFrame:
+    """Convert swap events into a column-oriented DataFrame.
+    
+    Columns follow SWAP_EVENT_COLUMNS. ``tick`` and ``block_number`` are
+    int64; amounts, prices and liquidity keep object dtype because they can
+    exceed 64 bits.
+    """
+    if events:
+        columns = zip(*(_get_swap_event_fields(event) for event in events))
+    else:
+        columns = ([] for _ in SWAP_EVENT_COLUMNS)
+    
+    return pd.DataFrame({
+        name: pd.Series(values, dtype='int64' if name in _SWAP_EVENT_INT64_COLUMNS else object)
+        for name, values in zip(SWAP_EVENT_COLUMNS, columns)
+    })
+
+
+def frame_to_swap_events(frame: pd.DataFrame) -> List[SwapEvent]:
+    """Convert a swap events DataFrame back into SwapEvent objects."""
+    columns = [frame[name].tolist() for name in SWAP_EVENT_COLUMNS]
+    return [SwapEvent(*row) for row in zip(*columns)]
+
+
+class OptimizedHTTPProvider(AsyncHTTPProvider):
+    """Async HTTP provider with a pooled aiohttp session and retry logic."""
+    
+    # HTTP statuses worth retrying (rate limiting and transient server errors)
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    
+    def __init__(self, endpoint_uri: str, pool_size: int = 20, max_connections_per_host: int = 10,
+                 max_retries: int = 3, backoff_factor: float = 0.1, timeout: int = 30):
+        super().__init__(endpoint_uri)
+        self.pool_size = pool_size
+        self.max_connections_per_host = max_connections_per_host
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def open_session(self) -> aiohttp.ClientSession:
+        """Create this provider's pooled session.
         
-        # Configure adapter with connection pooling
-        adapter = HTTPAdapter(
-            pool_connections=pool_connections,
-            pool_maxsize=pool_maxsize,
-            max_retries=retry_strategy
-        )
+        The session is kept out of web3's per-endpoint session cache, so
+        each provider keeps its own connection limits and closing it never
+        affects another provider on the same endpoint.
+        """
+        if self._session is None or self._session.closed:
+            # The per-host limit is what bounds concurrent RPCs to the node
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.max_connections_per_host
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+    
+    async def close_session(self):
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def decode_rpc_response(self, raw_response: bytes) -> Dict[str, Any]:
+        """Decode a JSON-RPC response body, with orjson when installed."""
+        if orjson is None:
+            return super().decode_rpc_response(raw_response)
+        return orjson.loads(raw_response)
+    
+    async def _with_retries(self, request_factory):
+        """Await ``request_factory()``, retrying transient failures with backoff."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await request_factory()
+            except aiohttp.ClientResponseError as e:
+                if e.status not in self.RETRY_STATUSES or attempt == self.max_retries:
+                    raise
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+    
+    async def _post(self, body: bytes) -> Any:
+        """POST a JSON-RPC body on the pooled session and decode the response."""
+        session = await self.open_session()
+        async with session.post(self.endpoint_uri, data=body,
+                                headers=self.get_request_headers()) as response:
+            response.raise_for_status()
+            return self.decode_rpc_response(await response.read())
+    
+    async def make_request(self, method, params):
+        """Send a JSON-RPC request, retrying transient failures with backoff."""
+        body = self.encode_rpc_request(method, params)
+        return await self._with_retries(lambda: self._post(body))
+    
+    async def make_batch_request(self, calls: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several JSON-RPC calls in one HTTP round trip.
         
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        web3 6.x has no batch API, so the JSON array is posted like a single
+        request, with the same retries as make_request.
         
-        super().__init__(endpoint_uri, session=session)
+        Args:
+            calls: (method, params) pairs
+            
+        Returns:
+            Raw JSON-RPC responses in the order of calls
+            
+        Raises:
+            ValueError: If the node rejects the batch or answers a different
+                number of calls
+        """
+        payload = [
+            {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        body = json.dumps(payload).encode()
+        
+        responses = await self._with_retries(lambda: self._post(body))
+        
+        # A node that rejects the batch answers with a single error object
+        if not isinstance(responses, list):
+            error = responses.get('error', responses) if isinstance(responses, dict) else responses
+            raise ValueError(f"Batch request rejected: {error}")
+        if len(responses) != len(calls):
+            raise ValueError(
+                f"Batch request returned {len(responses)} responses for {len(calls)} calls"
+            )
+        
+        # Nodes may answer batch entries in any order
+        return sorted(responses, key=itemgetter('id'))
+
 
 class DataFetcher:
     """Optimized data fetcher with connection pooling and batch requests."""
@@ -203,79 +388,205 @@ class DataFetcher:
     def __init__(self, rpc_url: str, max_workers: int = 20, max_concurrent_requests: int = 10, cache: Optional[ICacheProvider] = None):
         """Initialize optimized data fetcher.
         
+        The connection to the node is opened lazily on the first RPC call
+        (see connect).
+        
         Args:
             rpc_url: Ethereum RPC endpoint URL
-            max_workers: Maximum number of thread pool workers
-            max_concurrent_requests: Maximum concurrent RPC requests
+            max_workers: Size of the HTTP connection pool
+            max_concurrent_requests: Maximum concurrent RPC requests, enforced
+                as the connection pool's per-host limit
             cache: Optional cache provider for storing results
         """
-        # Initialize Web3 with optimized provider
-        self.w3 = Web3(OptimizedHTTPProvider(rpc_url))
+        self.rpc_url = rpc_url
+        
+        # Initialize async Web3 with optimized provider
+        self.w3 = AsyncWeb3(OptimizedHTTPProvider(
+            rpc_url,
+            pool_size=max_workers,
+            max_connections_per_host=max_concurrent_requests
+        ))
         
         # Cache provider
         self.cache = cache
         
-        # Retry connection with backoff
-        max_retries = 3
-        for attempt in range(max_retries):
-            if self.w3.is_connected():
-                break
-            if attempt < max_retries - 1:
-                import time
-                time.sleep(1)  # Wait 1 second before retry
+        # Connection state, guarded so concurrent first calls connect once
+        self._connected = False
+        self._connect_lock = asyncio.Lock()
         
-        if not self.w3.is_connected():
-            raise ConnectionError(f"Failed to connect to Ethereum node at {rpc_url[:50]}... after {max_retries} attempts")
+        # In-flight requests shared by concurrent callers (single-flight)
+        self._inflight: Dict[Any, asyncio.Future] = {}
         
-        # Optimized executor with more workers
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Pool contracts keyed by lower-cased address, built once per pool
+        self._pool_contracts: Dict[str, AsyncContract] = {}
         
-        # Rate limiting semaphore
-        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+        # Observed swap logs per block, keyed by lower-cased pool address
+        self._logs_per_block: Dict[str, float] = {}
         
         # Logger
         self.logger = logging.getLogger(__name__)
     
+    async def connect(self):
+        """Open the pooled HTTP session and verify the node is reachable.
+        
+        The reachability check runs once per endpoint per process.
+        
+        Raises:
+            ConnectionError: If the node cannot be reached after retries
+        """
+        async with self._connect_lock:
+            if self._connected:
+                return
+            
+            await self.w3.provider.open_session()
+            
+            # The endpoint was already reached by another fetcher
+            if self.rpc_url in _verified_endpoints:
+                self._connected = True
+                return
+            
+            # Retry connection with backoff
+            max_retries = 3
+            for attempt in range(max_retries):
+                if await self.w3.is_connected():
+                    _verified_endpoints.add(self.rpc_url)
+                    self._connected = True
+                    return
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1)  # Wait 1 second before retry
+            
+            raise ConnectionError(f"Failed to connect to Ethereum node at {self.rpc_url[:50]}... after {max_retries} attempts")
+    
+    async def close(self):
+        """Close the pooled HTTP session."""
+        await self.w3.provider.close_session()
+        self._connected = False
+    
     async def _rate_limited_call(self, func, *args, **kwargs):
-        """Execute function with rate limiting."""
-        async with self.semaphore:
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(self.executor, func, *args, **kwargs)
+        """Await an RPC coroutine.
+        
+        Requests beyond the connector's per-host limit wait for a free
+        connection, which provides the rate limiting.
+        """
+        if not self._connected:
+            await self.connect()
+        return await func(*args, **kwargs)
+    
+    def _get_pool_contract(self, pool_address: str) -> AsyncContract:
+        """Get the pool contract, constructing it on first use only."""
+        key = pool_address.lower()
+        contract = self._pool_contracts.get(key)
+        if contract is None:
+            contract = self.w3.eth.contract(
+                address=Web3.to_checksum_address(pool_address),
+                abi=POOL_ABI
+            )
+            self._pool_contracts[key] = contract
+        return contract
+    
+    async def _call_pool_function(self, address: str, name: str, *args,
+                                  block_identifier: Any = 'latest') -> Any:
+        """Call a view function on a pool with a raw eth_call.
+        
+        Encodes the call from the precomputed selector and types instead of
+        going through web3's contract function machinery.
+        
+        Args:
+            address: Checksummed pool address
+            name: Pool function name (key of POOL_FN_SELECTORS)
+            *args: Function arguments
+            block_identifier: Block number or tag to call at
+            
+        Returns:
+            The single return value, or a tuple for multi-value returns
+        """
+        data = POOL_FN_SELECTORS[name] + encode(POOL_FN_INPUT_TYPES[name], args)
+        raw = await self._rate_limited_call(
+            lambda: self.w3.eth.call({'to': address, 'data': data}, block_identifier)
+        )
+        return _decode_pool_result(name, bytes(raw))
+    
+    async def _multicall_pool_function(self, address: str, name: str, args_list: List[tuple],
+                                       block_identifier: Any = 'latest') -> List[Optional[Any]]:
+        """Call a pool view function once per argument tuple in a single eth_call.
+        
+        The calls are aggregated through Multicall3's tryAggregate, so a
+        reverted call yields None instead of failing the whole batch.
+        
+        Args:
+            address: Checksummed pool address
+            name: Pool function name (key of POOL_FN_SELECTORS)
+            args_list: Arguments of each call
+            block_identifier: Block number or tag to call at
+            
+        Returns:
+            Decoded results in the order of args_list, None for failed calls
+        """
+        selector = POOL_FN_SELECTORS[name]
+        input_types = POOL_FN_INPUT_TYPES[name]
+        calls = [(address, selector + encode(input_types, args)) for args in args_list]
+        data = MULTICALL3_TRY_AGGREGATE + encode(['bool', '(address,bytes)[]'], [False, calls])
+        raw = await self._rate_limited_call(
+            lambda: self.w3.eth.call({'to': MULTICALL3_ADDRESS, 'data': data}, block_identifier)
+        )
+        (results,) = decode(['(bool,bytes)[]'], bytes(raw))
+        return [
+            _decode_pool_result(name, return_data) if success else None
+            for success, return_data in results
+        ]
+    
+    async def _single_flight(self, key: Any, coro_factory):
+        """Execute ``coro_factory()`` once per key among concurrent callers.
+        
+        The first caller for a key runs the coroutine; callers arriving while
+        it is in flight await the same future instead of issuing another RPC.
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_event_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await coro_factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved so lone failures don't warn on garbage collection
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
     
     async def get_pool_state(self, pool_address: str, block_number: int) -> PoolState:
         """Get pool state with optimized batch calls."""
         # Check cache first
         if self.cache:
-            cache_key = CacheKeyBuilder.pool_state_key(pool_address, block_number)
-            cached_state = await self.cache.get(cache_key)
+            cached_state = await self.cache.get_raw('pool_state', pool_address, block_number)
             if cached_state:
                 self.logger.debug(f"Cache hit for pool state at block {block_number}")
                 return cached_state
         
-        pool_contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(pool_address),
-            abi=POOL_ABI
+        return await self._single_flight(
+            ('pool_state', pool_address.lower(), block_number),
+            lambda: self._fetch_pool_state(pool_address, block_number)
         )
+    
+    async def _fetch_pool_state(self, pool_address: str, block_number: int) -> PoolState:
+        """Fetch pool state from the node and store it in the cache."""
+        address = self._get_pool_contract(pool_address).address
         
-        # Batch all contract calls together
-        call_params = {'block_identifier': block_number}
-        
-        # Create batch of calls
-        calls = [
-            ('slot0', pool_contract.functions.slot0().call),
-            ('liquidity', pool_contract.functions.liquidity().call),
-            ('fee', pool_contract.functions.fee().call),
-            ('tickSpacing', pool_contract.functions.tickSpacing().call),
-            ('token0', pool_contract.functions.token0().call),
-            ('token1', pool_contract.functions.token1().call),
+        # Issue all pool calls concurrently with rate limiting
+        tasks = [
+            self._call_pool_function(address, name, block_identifier=block_number)
+            for name in POOL_STATE_FUNCTIONS
         ]
         
-        # Execute all calls concurrently with rate limiting
-        tasks = []
-        for name, call_func in calls:
-            task = self._rate_limited_call(lambda f=call_func: f(**call_params))
-            tasks.append(task)
-        
         try:
             results = await asyncio.gather(*tasks)
             
@@ -296,7 +607,10 @@ class DataFetcher:
             
             # Cache the result
             if self.cache:
-                await self.cache.set(cache_key, pool_state, ttl=86400)  # Cache for 24 hours
+                await self.cache.set_raw(
+                    'pool_state', pool_address, block_number,
+                    value=pool_state, ttl=86400  # Cache for 24 hours
+                )
                 self.logger.debug(f"Cached pool state for block {block_number}")
             
             return pool_state
@@ -305,6 +619,74 @@ class DataFetcher:
             self.logger.error(f"Error fetching pool state: {e}")
             raise
     
+    async def get_pool_states(self, pool_address: str, block_numbers: List[int]) -> List[PoolState]:
+        """Get pool states at several blocks in one JSON-RPC batch.
+        
+        Cached states are served from the cache; the pool calls for all
+        remaining blocks are sent to the node as a single batch request.
+        
+        Args:
+            pool_address: Pool contract address
+            block_numbers: Historical block numbers
+            
+        Returns:
+            Pool states in the order of block_numbers
+            
+        Raises:
+            ValueError: If the node returns an error for any call
+        """
+        states: Dict[int, PoolState] = {}
+        if self.cache:
+            for block_number in block_numbers:
+                cached_state = await self.cache.get_raw('pool_state', pool_address, block_number)
+                if cached_state:
+                    states[block_number] = cached_state
+        
+        missing = [block for block in dict.fromkeys(block_numbers) if block not in states]
+        if missing:
+            address = self._get_pool_contract(pool_address).address
+            calls = [
+                ('eth_call', [{'to': address, 'data': '0x' + POOL_FN_SELECTORS[name].hex()},
+                              hex(block_number)])
+                for block_number in missing
+                for name in POOL_STATE_FUNCTIONS
+            ]
+            responses = await self._rate_limited_call(self.w3.provider.make_batch_request, calls)
+            
+            # Responses come back in call order: one run of pool calls per block
+            n = len(POOL_STATE_FUNCTIONS)
+            for i, block_number in enumerate(missing):
+                results = []
+                for name, response in zip(POOL_STATE_FUNCTIONS, responses[i * n:(i + 1) * n]):
+                    if 'error' in response:
+                        raise ValueError(
+                            f"{name} call failed at block {block_number}: {response['error']}"
+                        )
+                    results.append(_decode_pool_result(name, bytes.fromhex(response['result'][2:])))
+                
+                slot0, liquidity, fee, tick_spacing, token0, token1 = results
+                pool_state = PoolState(
+                    sqrt_price_x96=slot0[0],
+                    tick=slot0[1],
+                    liquidity=liquidity,
+                    fee=fee,
+                    tick_spacing=tick_spacing,
+                    token0=token0,
+                    token1=token1,
+                    block_number=block_number
+                )
+                states[block_number] = pool_state
+                
+                if self.cache:
+                    await self.cache.set_raw(
+                        'pool_state', pool_address, block_number,
+                        value=pool_state, ttl=86400  # Cache for 24 hours
+                    )
+            
+            self.logger.debug(f"Fetched {len(missing)} pool states for {pool_address} in one batch")
+        
+        return [states[block_number] for block_number in block_numbers]
+    
     async def get_liquidity_distribution(self, 
                                        pool_address: str, 
                                        block_number: int,
@@ -349,23 +731,22 @@ class DataFetcher:
             reference point (current tick with current liquidity) and walk
             through ticks, applying these changes.
         """
-        # Step 1: Set up pool contract
-        pool_contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(pool_address),
-            abi=POOL_ABI
-        )
+        # Step 1: Get pool contract
+        pool_contract = self._get_pool_contract(pool_address)
+        
+        address = pool_contract.address
         
         # Step 2: Get pool configuration (tick spacing)
-        tick_spacing = await self._rate_limited_call(
-            lambda: pool_contract.functions.tickSpacing().call(block_identifier=block_number)
+        tick_spacing = await self._call_pool_function(
+            address, 'tickSpacing', block_identifier=block_number
         )
         
         # Step 3: Get current pool state (current tick and liquidity)
-        slot0_task = self._rate_limited_call(
-            lambda: pool_contract.functions.slot0().call(block_identifier=block_number)
+        slot0_task = self._call_pool_function(
+            address, 'slot0', block_identifier=block_number
         )
-        liquidity_task = self._rate_limited_call(
-            lambda: pool_contract.functions.liquidity().call(block_identifier=block_number)
+        liquidity_task = self._call_pool_function(
+            address, 'liquidity', block_identifier=block_number
         )
         
         slot0, current_pool_liquidity = await asyncio.gather(slot0_task, liquidity_task)
@@ -402,49 +783,81 @@ class DataFetcher:
         return tick + (tick_spacing - (tick % tick_spacing)) % tick_spacing
     
     async def _fetch_tick_data(self, 
-                              pool_contract: Contract,
+                              pool_contract: AsyncContract,
                               ticks_to_fetch: List[int],
                               block_number: int) -> Dict[int, Dict[str, int]]:
         """
-        Fetch tick data for multiple ticks in parallel.
+        Fetch tick data for multiple ticks.
+        
+        Ticks are read in Multicall3 batches of up to MULTICALL_BATCH_SIZE,
+        one eth_call each, with the batches sent in parallel.
         
         Returns:
             Dict mapping tick -> {'liquidity_gross': int, 'liquidity_net': int}
         """
-        # Create tasks for parallel execution
-        tasks = []
-        for tick in ticks_to_fetch:
-            task = self._rate_limited_call(
-                lambda t=tick: pool_contract.functions.ticks(t).call(
-                    block_identifier=block_number
-                )
+        address = pool_contract.address
+        pool_key = address.lower()
+        batches = [
+            ticks_to_fetch[i:i + MULTICALL_BATCH_SIZE]
+            for i in range(0, len(ticks_to_fetch), MULTICALL_BATCH_SIZE)
+        ]
+        tasks = [
+            self._single_flight(
+                ('ticks', pool_key, block_number, tuple(batch)),
+                lambda batch=batch: self._fetch_tick_batch(address, batch, block_number)
             )
-            tasks.append(task)
-        
-        # Execute all tick queries in parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            for batch in batches
+        ]
+        batch_results = await asyncio.gather(*tasks)
         
         # Process results into tick data dictionary
         tick_data = {}
-        for tick, result in zip(ticks_to_fetch, results):
-            if isinstance(result, Exception):
-                self.logger.warning(f"Error fetching tick {tick}: {result}")
-                continue
-            
-            # Unpack tick data tuple
-            liquidity_gross = result[0]
-            liquidity_net = result[1]
-            initialized = result[7]
-            
-            # Only store data for initialized ticks
-            if initialized:
-                tick_data[tick] = {
-                    'liquidity_gross': liquidity_gross,
-                    'liquidity_net': liquidity_net
-                }
+        for batch, results in zip(batches, batch_results):
+            for tick, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    self.logger.warning(f"Error fetching tick {tick}: {result}")
+                    continue
+                
+                # Unpack tick data tuple
+                liquidity_gross = result[0]
+                liquidity_net = result[1]
+                initialized = result[7]
+                
+                # Only store data for initialized ticks
+                if initialized:
+                    tick_data[tick] = {
+                        'liquidity_gross': liquidity_gross,
+                        'liquidity_net': liquidity_net
+                    }
         
         return tick_data
     
+    async def _fetch_tick_batch(self, address: str, ticks: List[int], block_number: int) -> List[Any]:
+        """
+        Read ticks() for a batch of ticks in one Multicall3 eth_call.
+        
+        Falls back to one eth_call per tick when the aggregate call fails,
+        e.g. at blocks before Multicall3 was deployed.
+        
+        Returns:
+            Tick data tuple for each tick, or the exception its read raised
+        """
+        try:
+            results = await self._multicall_pool_function(
+                address, 'ticks', [(tick,) for tick in ticks], block_identifier=block_number
+            )
+        except Exception as e:
+            self.logger.debug(f"Multicall for {len(ticks)} ticks failed, reading individually: {e}")
+            return await asyncio.gather(
+                *(self._call_pool_function(address, 'ticks', tick, block_identifier=block_number)
+                  for tick in ticks),
+                return_exceptions=True
+            )
+        return [
+            ValueError(f"ticks({tick}) reverted") if result is None else result
+            for tick, result in zip(ticks, results)
+        ]
+    
     def _calculate_liquidity_distribution(self,
                                         tick_lower: int,
                                         tick_upper: int,
@@ -473,90 +886,59 @@ class DataFetcher:
         - At 200020: 5M + (+200k) = 5.2M (apply the entry)
         - At 200030: 5.2M + (-100k) = 5.1M (apply the exit)
         
+        Both directions reduce to one prefix sum: liquidity at a tick is the
+        current liquidity plus the cumulative liquidity_net up to the tick's
+        aligned floor, minus the cumulative liquidity_net up to the reference.
+        
         Returns:
             Dict mapping tick -> liquidity at that tick
         """
-        filled_liquidity = {}
-        
         # Find the nearest initialized tick to use as reference
         reference_tick = current_tick - (current_tick % tick_spacing)
         
-        # Calculate liquidity for each tick in the range
-        for tick in range(tick_lower, tick_upper + 1):
-            if tick < reference_tick:
-                # Walking backwards from reference tick
-                liquidity = self._calculate_liquidity_backwards(
-                    current_pool_liquidity, reference_tick, tick, 
-                    tick_spacing, tick_data
-                )
-            elif tick == reference_tick:
-                # At reference tick, use current pool liquidity
-                liquidity = current_pool_liquidity
-            else:
-                # Walking forwards from reference tick
-                liquidity = self._calculate_liquidity_forwards(
-                    current_pool_liquidity, reference_tick, tick,
-                    tick_spacing, tick_data
-                )
-            
-            # Ensure liquidity never goes negative (safety check)
-            filled_liquidity[tick] = max(0, liquidity)
+        # Aligned ticks from the range's floor; every tick maps to the one at or below it
+        grid_lower = self._align_tick_lower(tick_lower, tick_spacing)
+        n_grid = (tick_upper - grid_lower) // tick_spacing + 1
         
-        return filled_liquidity
-    
-    def _calculate_liquidity_backwards(self,
-                                     start_liquidity: int,
-                                     start_tick: int,
-                                     target_tick: int,
-                                     tick_spacing: int,
-                                     tick_data: Dict[int, Dict[str, int]]) -> int:
-        """
-        Calculate liquidity when walking backwards from start_tick to target_tick.
-        
-        When moving backwards, we need to REVERSE the liquidity changes:
-        - If liquidity_net is positive at a tick, it means liquidity enters when
-          price crosses UP through that tick, so when going backwards (down),
-          we need to subtract it.
-        """
-        liquidity = start_liquidity
-        
-        # Walk backwards through ticks
-        for tick in range(start_tick, target_tick, -tick_spacing):
-            if tick in tick_data:
-                # Reverse the liquidity change
-                liquidity -= tick_data[tick]['liquidity_net']
-        
-        return liquidity
-    
-    def _calculate_liquidity_forwards(self,
-                                    start_liquidity: int,
-                                    start_tick: int,
-                                    target_tick: int,
-                                    tick_spacing: int,
-                                    tick_data: Dict[int, Dict[str, int]]) -> int:
-        """
-        Calculate liquidity when walking forwards from start_tick to target_tick.
-        
-        When moving forwards, we apply liquidity changes as-is:
-        - Positive liquidity_net means liquidity enters
-        - Negative liquidity_net means liquidity exits
-        """
-        liquidity = start_liquidity
+        # Net change at each aligned tick, and the cumulative net change from
+        # grid_lower to the reference tick (negative when the reference is below)
+        deltas = [0] * n_grid
+        reference_cumulative = 0
+        for tick, data in tick_data.items():
+            if tick % tick_spacing:
+                continue
+            liquidity_net = data['liquidity_net']
+            index = (tick - grid_lower) // tick_spacing
+            if 0 <= index < n_grid:
+                deltas[index] = liquidity_net
+            if grid_lower <= tick <= reference_tick:
+                reference_cumulative += liquidity_net
+            elif reference_tick < tick < grid_lower:
+                reference_cumulative -= liquidity_net
         
-        # Walk forwards through ticks
-        for tick in range(start_tick + tick_spacing, target_tick + 1, tick_spacing):
-            if tick in tick_data:
-                # Apply the liquidity change
-                liquidity += tick_data[tick]['liquidity_net']
+        # Ensure liquidity never goes negative (safety check)
+        offset = current_pool_liquidity - reference_cumulative
+        grid_liquidity = [max(0, offset + cumulative) for cumulative in accumulate(deltas)]
         
-        return liquidity
+        return {
+            tick: grid_liquidity[(tick - grid_lower) // tick_spacing]
+            for tick in range(tick_lower, tick_upper + 1)
+        }
     
     async def get_swap_events(self, 
                             pool_address: str, 
                             start_block: int, 
                             end_block: int,
                             chunk_size: int = 2000) -> List[SwapEvent]:
-        """Get swap events with optimized chunking and parallel processing."""
+        """
+        Get swap events with optimized chunking and parallel processing.
+        
+        Chunk size is tuned from the pool's observed swaps per block so each
+        request returns roughly TARGET_LOGS_PER_CHUNK logs; ``chunk_size`` is
+        the upper bound (e.g. the provider's maximum block range). For a pool
+        with no recorded density, the first DENSITY_PROBE_BLOCKS blocks are
+        fetched on their own to measure it.
+        """
         # Check cache first
         if self.cache:
             cache_key = CacheKeyBuilder.swap_events_key(pool_address, start_block, end_block)
@@ -565,55 +947,143 @@ class DataFetcher:
                 self.logger.debug(f"Cache hit for swap events blocks {start_block}-{end_block}")
                 return cached_events
         
-        pool_contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(pool_address),
-            abi=POOL_ABI
-        )
+        pool_contract = self._get_pool_contract(pool_address)
+        all_events = []
+        remaining_start = start_block
+        
+        # Estimate swaps per block, probing a small range for unknown pools
+        density = await self._get_log_density(pool_address)
+        if density is None:
+            probe_end = min(start_block + DENSITY_PROBE_BLOCKS - 1, end_block)
+            try:
+                probe_events = await self._fetch_events_chunk(pool_contract, start_block, probe_end)
+            except Exception as e:
+                self.logger.warning(f"Error fetching density probe chunk: {e}")
+            else:
+                all_events.extend(probe_events)
+                density = len(probe_events) / (probe_end - start_block + 1)
+                remaining_start = probe_end + 1
         
-        # Calculate optimal chunk size based on block range
-        total_blocks = end_block - start_block
-        if total_blocks < 100:
-            chunk_size = total_blocks
-        elif total_blocks > 10000:
-            chunk_size = min(chunk_size, total_blocks // 10)
+        # Calculate optimal chunk size from density and block range
+        if density:
+            chunk_size = min(chunk_size, max(MIN_CHUNK_SIZE, int(TARGET_LOGS_PER_CHUNK / density)))
+        remaining_blocks = end_block - remaining_start + 1
+        if remaining_blocks > 10000:
+            chunk_size = min(chunk_size, remaining_blocks // 10)
         
         # Create chunks for parallel processing
         chunks = []
-        for block_start in range(start_block, end_block + 1, chunk_size):
+        for block_start in range(remaining_start, end_block + 1, chunk_size):
             block_end = min(block_start + chunk_size - 1, end_block)
             chunks.append((block_start, block_end))
         
         # Process chunks in parallel with rate limiting
         tasks = []
         for chunk_start, chunk_end in chunks:
-            task = self._fetch_events_chunk(pool_contract, chunk_start, chunk_end)
+            task = self._fetch_events_range(pool_contract, chunk_start, chunk_end)
             tasks.append(task)
         
         # Execute all chunks concurrently
         chunk_results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Combine results
-        all_events = []
+        failed_chunks = 0
         for result in chunk_results:
             if isinstance(result, Exception):
                 self.logger.warning(f"Error fetching events chunk: {result}")
+                failed_chunks += 1
                 continue
             all_events.extend(result)
         
-        self.logger.info(f"Fetched {len(all_events)} swap events from {len(chunks)} chunks")
+        self.logger.info(f"Fetched {len(all_events)} swap events from {len(chunks)} chunks (chunk size {chunk_size})")
         
-        # Cache the result
-        if self.cache and all_events:
+        # Refine the density estimate when the whole range was fetched
+        if density is not None and failed_chunks == 0:
+            await self._record_log_density(
+                pool_address, len(all_events) / (end_block - start_block + 1)
+            )
+        
+        # Cache the result, unless chunks are missing from it
+        if self.cache and all_events and failed_chunks == 0:
             await self.cache.set(cache_key, all_events, ttl=86400)  # Cache for 24 hours
             self.logger.debug(f"Cached {len(all_events)} swap events")
         
         return all_events
     
-    async def _fetch_events_chunk(self, pool_contract: Contract, start_block: int, end_block: int) -> List[SwapEvent]:
+    async def _get_log_density(self, pool_address: str) -> Optional[float]:
+        """Get the recorded swap logs per block for a pool, if any."""
+        key = pool_address.lower()
+        density = self._logs_per_block.get(key)
+        if density is None and self.cache:
+            density = await self.cache.get(CacheKeyBuilder.pool_density_key(pool_address))
+            if density is not None:
+                self._logs_per_block[key] = density
+        return density
+    
+    async def _record_log_density(self, pool_address: str, density: float):
+        """Remember a pool's swap logs per block, persisting it to the cache."""
+        self._logs_per_block[pool_address.lower()] = density
+        if self.cache:
+            await self.cache.set(
+                CacheKeyBuilder.pool_density_key(pool_address), density, ttl=86400 * 7
+            )  # Cache for 7 days
+    
+    async def get_swap_events_table(self,
+                                    pool_address: str,
+                                    start_block: int,
+                                    end_block: int,
+                                    chunk_size: int = 2000) -> pd.DataFrame:
+        """
+        Get swap events as a column-oriented DataFrame.
+        
+        Same data as get_swap_events, laid out one column per field (see
+        SWAP_EVENT_COLUMNS) for vectorized volume/price analysis. Use
+        frame_to_swap_events to get SwapEvent objects back.
+        """
+        # Check cache first
+        if self.cache:
+            cache_key = CacheKeyBuilder.swap_events_table_key(pool_address, start_block, end_block)
+            cached_table = await self.cache.get(cache_key)
+            if cached_table is not None:
+                self.logger.debug(f"Cache hit for swap events table blocks {start_block}-{end_block}")
+                return cached_table
+        
+        events = await self.get_swap_events(pool_address, start_block, end_block, chunk_size)
+        table = swap_events_to_frame(events)
+        
+        # Cache the result
+        if self.cache and not table.empty:
+            await self.cache.set(cache_key, table, ttl=86400)  # Cache for 24 hours
+        
+        return table
+    
+    async def _fetch_events_range(self, pool_contract: AsyncContract, start_block: int, end_block: int) -> List[SwapEvent]:
+        """Fetch events for a chunk, splitting it if the node rejects the range.
+        
+        Nodes cap eth_getLogs by block range or result count. A chunk over
+        the cap is retried as two concurrent halves, down to MIN_CHUNK_SIZE
+        blocks; any other error is raised at once, since smaller requests
+        would fail the same way.
+        """
+        try:
+            return await self._fetch_events_chunk(pool_contract, start_block, end_block)
+        except Exception as e:
+            message = str(e).lower()
+            if (end_block - start_block + 1 <= MIN_CHUNK_SIZE
+                    or not any(marker in message for marker in LOG_RANGE_ERROR_MARKERS)):
+                raise
+            self.logger.debug(f"Splitting events chunk {start_block}-{end_block} after error: {e}")
+        
+        mid = (start_block + end_block) // 2
+        first, second = await asyncio.gather(
+            self._fetch_events_range(pool_contract, start_block, mid),
+            self._fetch_events_range(pool_contract, mid + 1, end_block)
+        )
+        return first + second
+    
+    async def _fetch_events_chunk(self, pool_contract: AsyncContract, start_block: int, end_block: int) -> List[SwapEvent]:
         """Fetch events for a single chunk with rate limiting."""
-        loop = asyncio.get_event_loop()
-        events = await loop.run_in_executor(
-            self.executor,
+        events = await self._rate_limited_call(
             lambda: pool_contract.events.Swap().get_logs(
                 fromBlock=start_block, 
                 toBlock=end_block
@@ -648,47 +1118,49 @@ class DataFetcher:
             block_number
         )
         
-        # Calculate price from sqrtPriceX96
+        # Calculate price from sqrtPriceX96 using exact integer arithmetic
         # sqrtPriceX96 = sqrt(reserve1/reserve0) * 2^96
-        # where reserve1 is in wei and reserve0 is in USDC smallest units
-        
-        sqrt_price = pool_state.sqrt_price_x96 / (2 ** 96)
-        price_raw = sqrt_price ** 2
-        
-        # price_raw = reserve1/reserve0 = wei per USDC smallest unit
+        # where reserve1 is in wei and reserve0 is in USDC smallest units,
+        # so sqrtPriceX96^2 / 2^192 = raw price = wei per USDC smallest unit.
+        #
         # To get USDC per ETH:
-        # 1. Invert to get USDC smallest units per wei
+        # 1. Invert to get USDC smallest units per wei: 2^192 / sqrtPriceX96^2
         # 2. Scale by decimals: multiply by 10^18 (wei per ETH) and divide by 10^6 (USDC units per USDC)
+        # => USDC per ETH = 10^12 * 2^192 / sqrtPriceX96^2
+        price_x192 = pool_state.sqrt_price_x96 * pool_state.sqrt_price_x96
+        if price_x192 == 0:
+            return 0.0
         
-        if price_raw > 0:
-            # USDC smallest units per wei = 1 / price_raw
-            # USDC per ETH = (1 / price_raw) * 10^18 / 10^6 = 10^12 / price_raw
-            usdc_per_eth = (10 ** 12) / price_raw
-        else:
-            usdc_per_eth = 0
-        
-        return float(usdc_per_eth)
+        # Int / int true division rounds once, at the float boundary
+        return (USDC_WETH_DECIMALS_SCALE << 192) / price_x192
     
     async def get_block_timestamp(self, block_number: int) -> int:
         """Get timestamp of a block."""
         # Check cache first
         if self.cache:
-            cache_key = CacheKeyBuilder.block_timestamp_key(block_number)
-            cached_timestamp = await self.cache.get(cache_key)
+            cached_timestamp = await self.cache.get_raw('block_timestamp', block_number)
             if cached_timestamp:
                 self.logger.debug(f"Cache hit for block timestamp {block_number}")
                 return cached_timestamp
         
-        loop = asyncio.get_event_loop()
-        block = await loop.run_in_executor(
-            self.executor,
+        return await self._single_flight(
+            ('block_timestamp', block_number),
+            lambda: self._fetch_block_timestamp(block_number)
+        )
+    
+    async def _fetch_block_timestamp(self, block_number: int) -> int:
+        """Fetch a block timestamp from the node and store it in the cache."""
+        block = await self._rate_limited_call(
             lambda: self.w3.eth.get_block(block_number)
         )
         timestamp = block['timestamp']
         
         # Cache the result
         if self.cache:
-            await self.cache.set(cache_key, timestamp, ttl=86400 * 7)  # Cache for 7 days
+            await self.cache.set_raw(
+                'block_timestamp', block_number,
+                value=timestamp, ttl=86400 * 7  # Cache for 7 days
+            )
             self.logger.debug(f"Cached timestamp for block {block_number}")
         
         return timestamp 
\ No newline at end of file
@@ -3,13 +3,41 @@
 import os
 import yaml
 import logging
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Union, get_args, get_origin, get_type_hints
+from dataclasses import dataclass, field, is_dataclass
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 import re
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Prefer the libyaml-backed loader; same result types as yaml.safe_load
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+    logger.debug("libyaml not available, using pure-Python YAML loader")
+
+# Optional: msgspec builds the nested config graph in one native pass
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Matches ${VAR_NAME} references to environment variables
+_ENV_VAR_RE = re.compile(r'\$\{([^}]+)\}')
+
+# Required keys of repeated config sections, fetched in one C-level call
+_get_pool_fields = itemgetter('address', 'name', 'fee_tier', 'token0', 'token1')
+_get_analysis_fields = itemgetter(
+    'start_block', 'end_block', 'initial_portfolio_value', 'portfolio_split', 'position'
+)
+_get_token_fields = itemgetter('address', 'symbol', 'decimals')
+_get_position_fields = itemgetter('tick_lower', 'tick_upper')
+
+
+@dataclass(frozen=True, slots=True)
 class TokenConfig:
     """Token configuration."""
     address: str
@@ -17,7 +45,7 @@ class TokenConfig:
     decimals: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PoolConfig:
     """Pool configuration."""
     address: str
@@ -27,14 +55,14 @@ class PoolConfig:
     token1: TokenConfig
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PositionConfig:
     """Position configuration."""
     tick_lower: int
     tick_upper: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AnalysisConfig:
     """Analysis parameters configuration."""
     start_block: int
@@ -44,15 +72,15 @@ class AnalysisConfig:
     position: PositionConfig
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OutputConfig:
     """Output configuration."""
-    directory: str
-    formats: list = field(default_factory=list)
+    directory: str = "output"
+    formats: list = field(default_factory=lambda: ['html', 'png'])
     save_raw_data: bool = True
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LoggingConfig:
     """Logging configuration."""
     level: str = "INFO"
@@ -60,7 +88,7 @@ class LoggingConfig:
     file: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EthereumConfig:
     """Ethereum connection configuration."""
     rpc_url: str
@@ -68,7 +96,7 @@ class EthereumConfig:
     timeout: int = 30
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PerformanceConfig:
     """Performance optimization configuration."""
     max_workers: int = 20
@@ -79,7 +107,7 @@ class PerformanceConfig:
     backoff_factor: float = 0.1
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CacheConfig:
     """Cache configuration."""
     enabled: bool = True
@@ -87,16 +115,16 @@ class CacheConfig:
     ttl: int = 3600
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
     """Main configuration container."""
     ethereum: EthereumConfig
-    performance: PerformanceConfig
-    pools: Dict[str, PoolConfig]
-    analysis: Dict[str, AnalysisConfig]
-    output: OutputConfig
-    logging: LoggingConfig
-    cache: CacheConfig
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
+    pools: Dict[str, PoolConfig] = field(default_factory=dict)
+    analysis: Dict[str, AnalysisConfig] = field(default_factory=dict)
+    output: OutputConfig = field(default_factory=OutputConfig)
+    logging: LoggingConfig = field(default_factory=LoggingConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
 
 
 class ConfigManager:
@@ -109,9 +137,11 @@ class ConfigManager:
             config_path: Path to configuration file. Defaults to config.yaml
         """
         self.config_path = Path(config_path or "config.yaml")
-        self._config_data: Optional[Dict[str, Any]] = None
         self._config: Optional[Config] = None
-        self.logger = logging.getLogger(__name__)
+        
+        # Lookups load on first use, then are rebound to the parsed dicts
+        self._get_pool = lambda pool_id: self.load().pools[pool_id]
+        self._get_analysis = lambda analysis_id: self.load().analysis[analysis_id]
     
     def load(self) -> Config:
         """Load and parse configuration.
@@ -129,43 +159,42 @@ class ConfigManager:
         # Load YAML file
         if not self.config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
-            
-        with open(self.config_path, 'r') as f:
-            self._config_data = yaml.safe_load(f)
-            
-        # Substitute environment variables
-        self._substitute_env_vars()
         
-        # Parse configuration
-        self._config = self._parse_config(self._config_data)
+        # Parse once per file version; other managers share the result
+        st = self.config_path.stat()
+        self._config = _load_config(str(self.config_path.resolve()), st.st_mtime_ns)
+        self._get_pool = self._config.pools.__getitem__
+        self._get_analysis = self._config.analysis.__getitem__
         
         # Setup logging
         self._setup_logging(self._config.logging)
         
         return self._config
     
-    def _substitute_env_vars(self):
-        """Substitute environment variables in config."""
-        def _substitute(obj):
-            if isinstance(obj, str):
-                # Look for ${VAR_NAME} pattern
-                pattern = r'\$\{([^}]+)\}'
-                matches = re.findall(pattern, obj)
-                for var_name in matches:
-                    env_value = os.getenv(var_name)
-                    if env_value is None:
-                        raise ValueError(f"Environment variable {var_name} not set")
-                    obj = obj.replace(f"${{{var_name}}}", env_value)
-                return obj
-            elif isinstance(obj, dict):
-                return {k: _substitute(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [_substitute(item) for item in obj]
-            return obj
+    @staticmethod
+    def _substitute_env_vars(data: Any):
+        """Substitute environment variables in config data in place."""
+        def _repl(match):
+            var_name = match.group(1)
+            env_value = os.getenv(var_name)
+            if env_value is None:
+                raise ValueError(f"Environment variable {var_name} not set")
+            return env_value
+
+        def _walk(obj):
+            # Substitute in place; strings without '$' skip the regex entirely
+            items = obj.items() if isinstance(obj, dict) else enumerate(obj)
+            for k, v in items:
+                if isinstance(v, (dict, list)):
+                    _walk(v)
+                elif isinstance(v, str) and '$' in v:
+                    obj[k] = _ENV_VAR_RE.sub(_repl, v)
         
-        self._config_data = _substitute(self._config_data)
+        if isinstance(data, (dict, list)):
+            _walk(data)
     
-    def _parse_config(self, data: Dict[str, Any]) -> Config:
+    @staticmethod
+    def _parse_config(data: Dict[str, Any]) -> Config:
         """Parse raw config data into typed configuration.
         
         Args:
@@ -173,86 +202,105 @@ class ConfigManager:
             
         Returns:
             Parsed Config object
+            
+        Raises:
+            ValueError: If config does not match the schema
         """
-        # Parse Ethereum config
-        eth_data = data.get('ethereum', {})
-        ethereum_config = EthereumConfig(
-            rpc_url=eth_data['rpc_url'],
-            retry_attempts=eth_data.get('retry_attempts', 3),
-            timeout=eth_data.get('timeout', 30)
-        )
+        if msgspec is not None:
+            try:
+                return msgspec.convert(data, Config)
+            except msgspec.ValidationError as e:
+                raise ValueError(f"Invalid configuration: {e}") from e
         
-        # Parse performance config
-        perf_data = data.get('performance', {})
-        performance_config = PerformanceConfig(
-            max_workers=perf_data.get('max_workers', 20),
-            max_concurrent_requests=perf_data.get('max_concurrent_requests', 10),
-            pool_connections=perf_data.get('pool_connections', 20),
-            pool_maxsize=perf_data.get('pool_maxsize', 20),
-            chunk_size=perf_data.get('chunk_size', 2000),
-            backoff_factor=perf_data.get('backoff_factor', 0.1)
-        )
+        # Unknown keys are ignored, as msgspec does; missing keys and
+        # non-mapping sections surface as KeyError/TypeError/AttributeError
+        try:
+            # Parse Ethereum config
+            eth_data = data.get('ethereum', {})
+            ethereum_config = EthereumConfig(
+                rpc_url=eth_data['rpc_url'],
+                retry_attempts=eth_data.get('retry_attempts', 3),
+                timeout=eth_data.get('timeout', 30)
+            )
         
-        # Parse pools
-        pools = {}
-        for pool_name, pool_data in data.get('pools', {}).items():
-            token0_data = pool_data['token0']
-            token1_data = pool_data['token1']
-            
-            pools[pool_name] = PoolConfig(
-                address=pool_data['address'],
-                name=pool_data['name'],
-                fee_tier=pool_data['fee_tier'],
-                token0=TokenConfig(**token0_data),
-                token1=TokenConfig(**token1_data)
+            # Parse performance config
+            perf_data = data.get('performance', {})
+            performance_config = PerformanceConfig(
+                max_workers=perf_data.get('max_workers', 20),
+                max_concurrent_requests=perf_data.get('max_concurrent_requests', 10),
+                pool_connections=perf_data.get('pool_connections', 20),
+                pool_maxsize=perf_data.get('pool_maxsize', 20),
+                chunk_size=perf_data.get('chunk_size', 2000),
+                backoff_factor=perf_data.get('backoff_factor', 0.1)
             )
         
-        # Parse analysis configs
-        analysis_configs = {}
-        for analysis_name, analysis_data in data.get('analysis', {}).items():
-            position_data = analysis_data['position']
+            # Parse pools
+            pools = {}
+            for pool_name, pool_data in data.get('pools', {}).items():
+                address, name, fee_tier, token0_data, token1_data = _get_pool_fields(pool_data)
+            
+                pools[pool_name] = PoolConfig(
+                    address=address,
+                    name=name,
+                    fee_tier=fee_tier,
+                    token0=TokenConfig(*_get_token_fields(token0_data)),
+                    token1=TokenConfig(*_get_token_fields(token1_data))
+                )
+        
+            # Parse analysis configs
+            analysis_configs = {}
+            for analysis_name, analysis_data in data.get('analysis', {}).items():
+                (start_block, end_block, initial_portfolio_value,
+                 portfolio_split, position_data) = _get_analysis_fields(analysis_data)
             
-            analysis_configs[analysis_name] = AnalysisConfig(
-                start_block=analysis_data['start_block'],
-                end_block=analysis_data['end_block'],
-                initial_portfolio_value=analysis_data['initial_portfolio_value'],
-                portfolio_split=analysis_data['portfolio_split'],
-                position=PositionConfig(**position_data)
+                analysis_configs[analysis_name] = AnalysisConfig(
+                    start_block=start_block,
+                    end_block=end_block,
+                    initial_portfolio_value=initial_portfolio_value,
+                    portfolio_split=portfolio_split,
+                    position=PositionConfig(*_get_position_fields(position_data))
+                )
+        
+            # Parse output config
+            output_data = data.get('output', {})
+            output_config = OutputConfig(
+                directory=output_data.get('directory', 'output'),
+                formats=output_data.get('formats', ['html', 'png']),
+                save_raw_data=output_data.get('save_raw_data', True)
             )
         
-        # Parse output config
-        output_data = data.get('output', {})
-        output_config = OutputConfig(
-            directory=output_data.get('directory', 'output'),
-            formats=output_data.get('formats', ['html', 'png']),
-            save_raw_data=output_data.get('save_raw_data', True)
-        )
+            # Parse logging config
+            logging_data = data.get('logging', {})
+            logging_config = LoggingConfig(
+                level=logging_data.get('level', 'INFO'),
+                format=logging_data.get('format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
+                file=logging_data.get('file')
+            )
         
-        # Parse logging config
-        logging_data = data.get('logging', {})
-        logging_config = LoggingConfig(
-            level=logging_data.get('level', 'INFO'),
-            format=logging_data.get('format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
-            file=logging_data.get('file')
-        )
+            # Parse cache config
+            cache_data = data.get('cache', {})
+            cache_config = CacheConfig(
+                enabled=cache_data.get('enabled', True),
+                directory=cache_data.get('directory', 'cache'),
+                ttl=cache_data.get('ttl', 3600)
+            )
         
-        # Parse cache config
-        cache_data = data.get('cache', {})
-        cache_config = CacheConfig(
-            enabled=cache_data.get('enabled', True),
-            directory=cache_data.get('directory', 'cache'),
-            ttl=cache_data.get('ttl', 3600)
-        )
+            config = Config(
+                ethereum=ethereum_config,
+                performance=performance_config,
+                pools=pools,
+                analysis=analysis_configs,
+                output=output_config,
+                logging=logging_config,
+                cache=cache_config
+            )
+    
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid configuration: {e}") from e
         
-        return Config(
-            ethereum=ethereum_config,
-            performance=performance_config,
-            pools=pools,
-            analysis=analysis_configs,
-            output=output_config,
-            logging=logging_config,
-            cache=cache_config
-        )
+        # Reject the same wrongly typed values msgspec does
+        _check_types(config, Config, 'config')
+        return config
     
     def _setup_logging(self, logging_config: LoggingConfig):
         """Setup logging based on configuration."""
@@ -279,13 +327,10 @@ class ConfigManager:
         Raises:
             KeyError: If pool not found
         """
-        if not self._config:
-            self.load()
-        
-        if pool_id not in self._config.pools:
-            raise KeyError(f"Pool '{pool_id}' not found in configuration")
-            
-        return self._config.pools[pool_id]
+        try:
+            return self._get_pool(pool_id)
+        except KeyError:
+            raise KeyError(f"Pool '{pool_id}' not found in configuration") from None
     
     def get_analysis_config(self, analysis_id: str = "default") -> AnalysisConfig:
         """Get analysis configuration by ID.
@@ -299,10 +344,78 @@ class ConfigManager:
         Raises:
             KeyError: If analysis config not found
         """
-        if not self._config:
-            self.load()
+        try:
+            return self._get_analysis(analysis_id)
+        except KeyError:
+            raise KeyError(f"Analysis config '{analysis_id}' not found") from None
+
+
+@lru_cache(maxsize=None)
+def _field_types(cls: type) -> Dict[str, Any]:
+    """Field name -> annotated type of a config dataclass."""
+    return get_type_hints(cls)
+
+
+def _matches_type(value: Any, field_type: Any) -> bool:
+    """Check a value against a config field type, as strict msgspec does.
+    
+    bool is not accepted as int or float; int is accepted as float.
+    """
+    if get_origin(field_type) is Union:
+        return any(_matches_type(value, arg) for arg in get_args(field_type))
+    if isinstance(value, bool):
+        return field_type is bool
+    if field_type is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, get_origin(field_type) or field_type)
+
+
+def _check_types(value: Any, field_type: Any, path: str):
+    """Check a parsed config, recursing into dataclasses and dicts of them.
+    
+    Raises:
+        ValueError: If a value does not match its annotated type
+    """
+    if is_dataclass(field_type):
+        for name, sub_type in _field_types(field_type).items():
+            _check_types(getattr(value, name), sub_type, f"{path}.{name}")
+    elif get_origin(field_type) is dict:
+        key_type, item_type = get_args(field_type)
+        for key, item in value.items():
+            if not _matches_type(key, key_type):
+                raise ValueError(
+                    f"Invalid configuration: expected {key_type.__name__} key in {path}, got {key!r}"
+                )
+            _check_types(item, item_type, f"{path}.{key}")
+    elif not _matches_type(value, field_type):
+        expected = (field_type.__name__ if isinstance(field_type, type)
+                    else str(field_type).replace('typing.', ''))
+        raise ValueError(
+            f"Invalid configuration: expected {expected} at {path}, got {type(value).__name__}"
+        )
+
+
+@lru_cache(maxsize=16)
+def _load_config(path: str, mtime_ns: int) -> Config:
+    """Read, substitute and parse a config file.
+    
+    Cached by path and modification time, so an unchanged file is parsed
+    once per process. Environment variables are read on the first load.
+    
+    Args:
+        path: Resolved path to the configuration file
+        mtime_ns: File modification time, part of the cache key
         
-        if analysis_id not in self._config.analysis:
-            raise KeyError(f"Analysis config '{analysis_id}' not found")
-            
-        return self._config.analysis[analysis_id] 
\ No newline at end of file
+    Returns:
+        Parsed Config object
+    """
+    # libyaml decodes the bytes itself; no text-mode file wrapper needed
+    raw = Path(path).read_bytes()
+    data = yaml.load(raw, Loader=_YamlLoader)
+    
+    # Substitute environment variables; most local configs have none
+    if b'${' in raw:
+        ConfigManager._substitute_env_vars(data)
+    
+    # Parse configuration
+    return ConfigManager._parse_config(data)
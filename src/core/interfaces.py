@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PoolState:
     """Generic pool state representation."""
     pool_address: str
@@ -15,7 +15,7 @@ class PoolState:
     data: Dict[str, Any] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Position:
     """Generic position representation."""
     pool_address: str
@@ -23,7 +23,7 @@ class Position:
     data: Dict[str, Any] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SwapEvent:
     """Generic swap event representation."""
     pool_address: str
@@ -34,7 +34,7 @@ class SwapEvent:
     data: Dict[str, Any] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AnalysisResult:
     """Generic analysis result container."""
     position: Position
@@ -153,4 +153,12 @@ class ICacheProvider(ABC):
     @abstractmethod
     async def clear(self):
         """Clear all cache entries."""
-        pass 
\ No newline at end of file
+        pass
+    
+    async def get_raw(self, *components: Any) -> Optional[Any]:
+        """Get value stored under the ':'-joined key components."""
+        return await self.get(':'.join(map(str, components)))
+    
+    async def set_raw(self, *components: Any, value: Any, ttl: Optional[int] = None):
+        """Set value under the ':'-joined key components with optional TTL."""
+        await self.set(':'.join(map(str, components)), value, ttl=ttl) 
\ No newline at end of file
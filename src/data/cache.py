@@ -1,85 +1,174 @@
 """Cache implementations for data storage."""
 
-import json
+import os
+import time
 import pickle
+from collections import OrderedDict
+import struct
 import hashlib
 import logging
 import asyncio
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Any, Optional
+from contextlib import AsyncExitStack
+from functools import lru_cache
+from itertools import count
+from typing import Any, Optional, Tuple
 
 from ..core.interfaces import ICacheProvider
 
+logger = logging.getLogger(__name__)
+
+# Entry header: expiry as POSIX timestamp, payload length
+_HEADER = struct.Struct('<dI')
+
+# Default number of decoded values kept in memory per cache
+MEMORY_CACHE_ENTRIES = 1024
+
+# Number of lock stripes; keys hashing to different stripes proceed concurrently
+_LOCK_STRIPES = 64
+
+# Sequence numbers making temp file names unique within the process
+_tmp_ids = count()
+
+
+@lru_cache(maxsize=4096)
+def _hash_key(key: str) -> str:
+    """Hash a cache key into a filesystem-safe name."""
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def _hash_components(components: Tuple[Any, ...]) -> str:
+    """Hash key components to the same name as their ':'-joined key."""
+    key = ':'.join(map(str, components))
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
 
 class FileCache(ICacheProvider):
-    """File-based cache implementation."""
+    """File-based cache implementation.
     
-    def __init__(self, cache_dir: str = "cache", default_ttl: int = 3600):
+    Recently used values are also kept decoded in an in-process LRU, so hot
+    keys skip the disk read and unpickle. Values are returned by reference
+    and should be treated as read-only.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: str = "cache",
+        default_ttl: int = 3600,
+        memory_entries: int = MEMORY_CACHE_ENTRIES
+    ):
         """Initialize file cache.
         
         Args:
             cache_dir: Directory for cache files
             default_ttl: Default TTL in seconds
+            memory_entries: Maximum values kept in the in-process LRU (0 disables)
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.default_ttl = default_ttl
-        self.logger = logging.getLogger(__name__)
-        self._lock = asyncio.Lock()
+        self._locks = [asyncio.Lock() for _ in range(_LOCK_STRIPES)]
+        self._mem: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._mem_max = memory_entries
+        # Temp files of writes in flight, which clear() must leave alone
+        self._pending_tmp: set = set()
     
-    def _get_cache_path(self, key: str) -> Path:
-        """Get file path for cache key."""
-        # Create hash of key to avoid filesystem issues
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return self.cache_dir / f"{key_hash}.cache"
+    def _lock_for(self, key_hash: str) -> asyncio.Lock:
+        """Get the lock stripe guarding a hashed cache key."""
+        return self._locks[hash(key_hash) % _LOCK_STRIPES]
     
-    def _get_metadata_path(self, key: str) -> Path:
-        """Get metadata file path for cache key."""
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return self.cache_dir / f"{key_hash}.meta"
+    def _get_cache_path(self, key_hash: str) -> Path:
+        """Get file path for a hashed cache key."""
+        return self.cache_dir / f"{key_hash}.cache"
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache.
         
+        Disk reads run in a worker thread so large entries don't block the
+        event loop.
+        
         Args:
             key: Cache key
             
         Returns:
             Cached value or None if not found/expired
         """
-        async with self._lock:
-            cache_path = self._get_cache_path(key)
-            meta_path = self._get_metadata_path(key)
+        # Hash key to avoid filesystem issues
+        return await self._get(_hash_key(key), key)
+    
+    async def get_raw(self, *components: Any) -> Optional[Any]:
+        """Get value from cache by key components.
+        
+        Equivalent to get(':'.join(components)), but the hash is memoized on
+        the components tuple so hot keys never build the joined string.
+        
+        Args:
+            components: Key parts, e.g. ('pool_state', address, block)
             
-            if not cache_path.exists() or not meta_path.exists():
-                self.logger.debug(f"Cache miss for key: {key}")
+        Returns:
+            Cached value or None if not found/expired
+        """
+        return await self._get(_hash_components(components), components)
+    
+    async def _get(self, key_hash: str, key: Any) -> Optional[Any]:
+        """Look up a hashed key in memory, then on disk."""
+        # Check in-process LRU first
+        entry = self._mem.get(key_hash)
+        if entry is not None:
+            if time.time() <= entry[0]:
+                self._mem.move_to_end(key_hash)
+                return entry[1]
+            del self._mem[key_hash]
+        
+        async with self._lock_for(key_hash):
+            entry = await asyncio.to_thread(self._read, key_hash, key)
+            if entry is None:
                 return None
-            
-            try:
-                # Check metadata
-                with open(meta_path, 'r') as f:
-                    metadata = json.load(f)
+            self._remember(key_hash, entry)
+        return entry[1]
+    
+    def _remember(self, key_hash: str, entry: Tuple[float, Any]):
+        """Store an (expiry, value) entry in the in-process LRU."""
+        if self._mem_max <= 0:
+            return
+        self._mem[key_hash] = entry
+        self._mem.move_to_end(key_hash)
+        if len(self._mem) > self._mem_max:
+            self._mem.popitem(last=False)
+    
+    def _read(self, key_hash: str, key: Any) -> Optional[Tuple[float, Any]]:
+        """Blocking implementation of get; returns (expiry, value)."""
+        cache_path = self._get_cache_path(key_hash)
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                expiry, size = _HEADER.unpack(f.read(_HEADER.size))
                 
                 # Check expiration
-                expiry = datetime.fromisoformat(metadata['expiry'])
-                if datetime.now() > expiry:
-                    self.logger.debug(f"Cache expired for key: {key}")
-                    # Clean up expired cache
-                    cache_path.unlink(missing_ok=True)
-                    meta_path.unlink(missing_ok=True)
+                if time.time() > expiry:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Cache expired for key: {key}")
+                    # Clean up expired cache, unless another process has
+                    # already replaced the file with a fresh entry
+                    if os.path.samestat(os.fstat(f.fileno()), os.stat(cache_path)):
+                        cache_path.unlink(missing_ok=True)
                     return None
                 
                 # Load cached value
-                with open(cache_path, 'rb') as f:
-                    value = pickle.load(f)
-                
-                self.logger.debug(f"Cache hit for key: {key}")
-                return value
-                
-            except Exception as e:
-                self.logger.error(f"Error reading cache for key {key}: {e}")
-                return None
+                value = pickle.loads(f.read(size))
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Cache hit for key: {key}")
+            return expiry, value
+            
+        except FileNotFoundError:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Cache miss for key: {key}")
+            return None
+        except Exception as e:
+            logger.error(f"Error reading cache for key {key}: {e}")
+            return None
     
     async def set(self, key: str, value: Any, ttl: Optional[int] = None):
         """Set value in cache.
@@ -89,35 +178,69 @@ class FileCache(ICacheProvider):
             value: Value to cache
             ttl: Time to live in seconds
         """
-        async with self._lock:
-            cache_path = self._get_cache_path(key)
-            meta_path = self._get_metadata_path(key)
-            
-            ttl = ttl or self.default_ttl
-            expiry = datetime.now() + timedelta(seconds=ttl)
+        await self._set(_hash_key(key), key, value, ttl)
+    
+    async def set_raw(self, *components: Any, value: Any, ttl: Optional[int] = None):
+        """Set value in cache by key components.
+        
+        Args:
+            components: Key parts, e.g. ('pool_state', address, block)
+            value: Value to cache
+            ttl: Time to live in seconds
+        """
+        await self._set(_hash_components(components), components, value, ttl)
+    
+    async def _set(self, key_hash: str, key: Any, value: Any, ttl: Optional[int]):
+        """Store a hashed key on disk, then in memory."""
+        ttl = ttl or self.default_ttl
+        expiry = time.time() + ttl
+        
+        # Encode and write the temp file without the lock; only swapping it
+        # into place is serialized with get, delete and clear
+        tmp_name = f"{key_hash}.{os.getpid()}.{next(_tmp_ids)}.tmp"
+        self._pending_tmp.add(tmp_name)
+        try:
+            tmp_path = self.cache_dir / tmp_name
+            if not await asyncio.to_thread(self._write_tmp, tmp_path, key, value, expiry):
+                return
+            async with self._lock_for(key_hash):
+                # Memory only takes values that made it to disk, so both layers agree
+                if await asyncio.to_thread(self._replace, tmp_path, key_hash, key, expiry):
+                    self._remember(key_hash, (expiry, value))
+        finally:
+            self._pending_tmp.discard(tmp_name)
+    
+    def _write_tmp(self, tmp_path: Path, key: Any, value: Any, expiry: float) -> bool:
+        """Blocking part of set: write the entry to its temp file."""
+        try:
+            # Save expiry header and value together; the file is swapped into
+            # place afterwards so readers never see a partially written entry
+            # Pickle, not msgpack: values carry uint160/int256 chain integers
+            # beyond msgpack's 64-bit range, and DataFrames
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            with open(tmp_path, 'xb') as f:
+                f.write(_HEADER.pack(expiry, len(payload)))
+                f.write(payload)
+            return True
             
-            try:
-                # Save metadata
-                metadata = {
-                    'key': key,
-                    'created': datetime.now().isoformat(),
-                    'expiry': expiry.isoformat(),
-                    'ttl': ttl
-                }
-                with open(meta_path, 'w') as f:
-                    json.dump(metadata, f)
-                
-                # Save value
-                with open(cache_path, 'wb') as f:
-                    pickle.dump(value, f)
-                
-                self.logger.debug(f"Cached value for key: {key} (TTL: {ttl}s)")
-                
-            except Exception as e:
-                self.logger.error(f"Error caching value for key {key}: {e}")
-                # Clean up on error
-                cache_path.unlink(missing_ok=True)
-                meta_path.unlink(missing_ok=True)
+        except Exception as e:
+            logger.error(f"Error caching value for key {key}: {e}")
+            # Clean up on error
+            tmp_path.unlink(missing_ok=True)
+            return False
+    
+    def _replace(self, tmp_path: Path, key_hash: str, key: Any, expiry: float) -> bool:
+        """Blocking part of set: move the temp file over the entry."""
+        try:
+            os.replace(tmp_path, self._get_cache_path(key_hash))
+        except Exception as e:
+            logger.error(f"Error caching value for key {key}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Cached value for key: {key} (expires: {expiry:.0f})")
+        return True
     
     async def delete(self, key: str):
         """Delete value from cache.
@@ -125,27 +248,39 @@ class FileCache(ICacheProvider):
         Args:
             key: Cache key
         """
-        async with self._lock:
-            cache_path = self._get_cache_path(key)
-            meta_path = self._get_metadata_path(key)
-            
-            cache_path.unlink(missing_ok=True)
-            meta_path.unlink(missing_ok=True)
+        key_hash = _hash_key(key)
+        async with self._lock_for(key_hash):
+            self._mem.pop(key_hash, None)
+            self._get_cache_path(key_hash).unlink(missing_ok=True)
             
-            self.logger.debug(f"Deleted cache for key: {key}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Deleted cache for key: {key}")
     
     async def clear(self):
-        """Clear all cache entries."""
-        async with self._lock:
-            # Remove all cache files
-            for cache_file in self.cache_dir.glob("*.cache"):
-                cache_file.unlink(missing_ok=True)
+        """Clear all cache entries.
+        
+        A set() still in flight when clear() starts may land after it, as if
+        it had been called afterwards.
+        """
+        async with AsyncExitStack() as stack:
+            # Take every stripe so no get, delete or set lands mid-clear
+            for lock in self._locks:
+                await stack.enter_async_context(lock)
+            
+            self._mem.clear()
             
-            # Remove all metadata files
-            for meta_file in self.cache_dir.glob("*.meta"):
-                meta_file.unlink(missing_ok=True)
+            # Remove entries, plus .meta files from the old two-file layout
+            # and temp files left by interrupted writes, in one directory pass
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if (entry.name.endswith(('.cache', '.meta', '.tmp'))
+                            and entry.name not in self._pending_tmp):
+                        try:
+                            os.unlink(entry.path)
+                        except FileNotFoundError:
+                            pass
             
-            self.logger.info("Cleared all cache entries")
+            logger.info("Cleared all cache entries")
 
 
 class CacheKeyBuilder:
@@ -161,6 +296,16 @@ class CacheKeyBuilder:
         """Build cache key for swap events."""
         return f"swap_events:{pool_address}:{start_block}:{end_block}"
     
+    @staticmethod
+    def swap_events_table_key(pool_address: str, start_block: int, end_block: int) -> str:
+        """Build cache key for the column-oriented swap events table."""
+        return f"swap_events_table:{pool_address}:{start_block}:{end_block}"
+    
+    @staticmethod
+    def pool_density_key(pool_address: str) -> str:
+        """Build cache key for a pool's observed swap logs per block."""
+        return f"pool_density:{pool_address.lower()}"
+    
     @staticmethod
     def liquidity_distribution_key(
         pool_address: str, 
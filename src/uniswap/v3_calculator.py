@@ -5,6 +5,7 @@ Uniswap V3 liquidity mathematics and position calculations.
 import math
 from typing import Tuple, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 from decimal import Decimal
 
 # Constants
@@ -12,7 +13,7 @@ Q96 = 2 ** 96
 Q128 = 2 ** 128
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Position:
     """Represents a Uniswap V3 liquidity position."""
     liquidity: int
@@ -37,8 +38,13 @@ class UniswapV3Calculator:
         return int(math.floor(math.log(price) / math.log(1.0001)))
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def get_sqrt_ratio_at_tick(tick: int) -> int:
-        """Get sqrt price ratio at a specific tick."""
+        """Get sqrt price ratio at a specific tick.
+        
+        Memoized: position bounds recur across analyses, and the result is
+        a pure function of the tick.
+        """
         abs_tick = abs(tick)
         
         # Precomputed values for efficiency
@@ -2,27 +2,104 @@
 Visualization module for generating plots and reports.
 """
 
+import matplotlib
+matplotlib.use('Agg')  # Files only; skip GUI backend setup
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.gridspec import GridSpec
+from matplotlib.figure import Figure
+from matplotlib.colors import to_rgba
+from matplotlib.ticker import MaxNLocator
 import seaborn as sns
 import pandas as pd
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Mapping, Callable
 import numpy as np
 from datetime import datetime
 import base64
-from io import BytesIO
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO, StringIO
+from itertools import chain
 
 from src.uniswap import Position
 from src.blockchain import PoolState
 
+# Lighter zlib level for PNG output: plots are mostly flat color, so the
+# files barely grow while encoding is several times faster
+PNG_PIL_KWARGS = {'compress_level': 3, 'optimize': False}
+
+_STYLE_INITIALIZED = False
+
+
+def _init_style():
+    """Apply the shared plot style once per process."""
+    global _STYLE_INITIALIZED
+    if _STYLE_INITIALIZED:
+        return
+    
+    # Set professional style
+    plt.style.use('seaborn-v0_8-whitegrid')
+    
+    # Set font properties
+    plt.rcParams.update({
+        'font.family': 'sans-serif',
+        'font.sans-serif': ['Arial', 'DejaVu Sans'],
+        'font.size': 10,
+    })
+    
+    _STYLE_INITIALIZED = True
+
+
+def _densify(values_by_tick: Dict[int, int], tick_lo: int, n: int) -> np.ndarray:
+    """Scatter sparse per-tick values into a dense array over [tick_lo, tick_lo + n).
+    
+    Ticks outside the window are dropped and missing ticks are zero. The
+    result is float64 because uint128 liquidity can overflow int64.
+    """
+    out = np.zeros(n)
+    if not values_by_tick:
+        return out
+    
+    count = len(values_by_tick)
+    keys = np.fromiter(values_by_tick.keys(), dtype=np.int64, count=count) - tick_lo
+    values = np.fromiter(values_by_tick.values(), dtype=np.float64, count=count)
+    in_window = (keys >= 0) & (keys < n)
+    out[keys[in_window]] = values[in_window]
+    return out
+
+
+def _insight_metrics(fees: float, deployed_capital: float, tick_lower: int, tick_upper: int,
+                     tick_start: int, tick_end: int) -> Tuple[float, float]:
+    """Compute the numeric inputs of the report insights.
+    
+    Returns:
+        (fee_roi, range_efficiency), both in percent. Range efficiency is the
+        share of position ticks between the start and end pool ticks.
+    """
+    fee_roi = fees / deployed_capital * 100
+    
+    # Overlap of the position range with the start/end price range, O(1)
+    price_lo, price_hi = min(tick_start, tick_end), max(tick_start, tick_end)
+    ticks_in_range = max(0, min(tick_upper, price_hi) - max(tick_lower, price_lo) + 1)
+    range_efficiency = ticks_in_range / (tick_upper - tick_lower + 1) * 100
+    
+    return fee_roi, range_efficiency
+
+
+def _init_render_worker():
+    """Select the Agg backend in a chart worker process."""
+    matplotlib.use('Agg')
+
+
+def _render_chart(chart: Callable[['Visualizer'], None]):
+    """Render one chart in a worker process on its own Visualizer."""
+    chart(Visualizer())
+
 
 class Visualizer:
     """Handles visualization of Uniswap V3 analysis results."""
     
     def __init__(self):
-        # Set professional style
-        plt.style.use('seaborn-v0_8-whitegrid')
+        _init_style()
         
         # Define color palette
         self.colors = {
@@ -38,10 +115,34 @@ class Visualizer:
             'pool': '#8c564b',        # Brown
         }
         
-        # Set font properties
-        plt.rcParams['font.family'] = 'sans-serif'
-        plt.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans']
-        plt.rcParams['font.size'] = 10
+        # Figure reused across charts; cleared and resized per call
+        self._fig = None
+        # Summary chart figure and axes, built on the first report and
+        # reused by clearing the axes
+        self._summary_axes = None
+    
+    def _get_fig(self, figsize: Tuple[float, float]):
+        """Get the shared figure, cleared and resized for the next chart."""
+        if self._fig is None:
+            # Constrained layout solves spacing once, at draw time, instead
+            # of a separate tight_layout pass per chart. Built without pyplot,
+            # so no global figure manager keeps it alive after the Visualizer
+            self._fig = Figure(figsize=figsize, layout='constrained')
+        else:
+            self._fig.clear()
+            self._fig.set_size_inches(figsize)
+        return self._fig
+    
+    def _get_summary_axes(self):
+        """Get the summary chart's two axes, cleared for the next report."""
+        if self._summary_axes is None:
+            # Not registered with pyplot, like the shared chart figure
+            fig = Figure(figsize=(12, 5), layout='constrained')
+            self._summary_axes = tuple(fig.subplots(1, 2))
+        else:
+            for ax in self._summary_axes:
+                ax.clear()
+        return self._summary_axes
     
     def plot_liquidity_distribution(
         self,
@@ -55,16 +156,18 @@ class Visualizer:
         """Plot enhanced liquidity distribution with position overlay."""
         # Prepare data
         ticks = np.arange(tick_lower - 20, tick_upper + 21)
-        total_liquidity = np.array([liquidity_distribution.get(tick, 0) for tick in ticks])
-        position_liquidity = np.where(
-            (ticks >= position.tick_lower) & (ticks <= position.tick_upper),
-            position.liquidity,
-            0
-        )
+        
+        total_liquidity = _densify(liquidity_distribution, int(ticks[0]), ticks.size)
+        
+        # Position liquidity is constant over its range: one slice store
+        position_liquidity = np.zeros_like(total_liquidity)
+        lo_i = max(0, position.tick_lower - int(ticks[0]))
+        hi_i = min(ticks.size, position.tick_upper - int(ticks[0]) + 1)
+        position_liquidity[lo_i:hi_i] = position.liquidity
         
         # Create figure with custom layout
-        fig = plt.figure(figsize=(14, 8))
-        gs = GridSpec(3, 1, height_ratios=[2.5, 0.5, 0.5], hspace=0.3)
+        fig = self._get_fig((14, 8))
+        gs = fig.add_gridspec(3, 1, height_ratios=[2.5, 0.5, 0.5])
         
         # Main liquidity plot
         ax_main = fig.add_subplot(gs[0])
@@ -79,19 +182,16 @@ class Visualizer:
                                    label='Our Position', color=self.colors['position'],
                                    edgecolor='none')
         
-        # Mark position boundaries
-        ax_main.axvline(x=position.tick_lower, color=self.colors['danger'], 
-                       linestyle='--', linewidth=2, alpha=0.8)
-        ax_main.axvline(x=position.tick_upper, color=self.colors['danger'], 
-                       linestyle='--', linewidth=2, alpha=0.8)
-        
         # Mark current tick
         ax_main.axvline(x=current_tick, color=self.colors['success'], 
                        linestyle='-', linewidth=3, alpha=0.9, label='Current Price')
         
-        # Add shaded region for position range
-        ax_main.axvspan(position.tick_lower, position.tick_upper, 
-                       alpha=0.1, color=self.colors['position'])
+        # Shade position range; the patch edge draws the dashed boundaries.
+        # Alpha lives in each RGBA so the faint fill doesn't fade the edges.
+        ax_main.axvspan(position.tick_lower, position.tick_upper,
+                       facecolor=to_rgba(self.colors['position'], 0.1),
+                       edgecolor=to_rgba(self.colors['danger'], 0.8),
+                       linestyle='--', linewidth=2)
         
         # Styling
         ax_main.set_xlabel('Tick', fontsize=12, fontweight='bold')
@@ -131,7 +231,7 @@ class Visualizer:
         ax_metrics.axis('off')
         
         total_position_liquidity = position.liquidity * (position.tick_upper - position.tick_lower + 1)
-        total_pool_liquidity = sum(total_liquidity)
+        total_pool_liquidity = float(total_liquidity.sum())
         overall_share = (total_position_liquidity / total_pool_liquidity * 100) if total_pool_liquidity > 0 else 0
         
         metrics_text = (f"Position Range: {position.tick_upper - position.tick_lower + 1} ticks | "
@@ -141,13 +241,12 @@ class Visualizer:
         ax_metrics.text(0.5, 0.5, metrics_text, ha='center', va='center', 
                        fontsize=10, color=self.colors['dark'])
         
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white',
+                    pil_kwargs=PNG_PIL_KWARGS)
     
     def plot_fee_accumulation(
         self,
-        fee_by_tick: Dict[int, Tuple[float, float]],
+        fee_by_tick: Mapping[int, Tuple[float, float]],
         tick_lower: int,
         tick_upper: int,
         eth_price: float,
@@ -155,29 +254,45 @@ class Visualizer:
     ):
         """Plot enhanced fee accumulation with multiple views."""
         # Prepare data
-        ticks = np.array(sorted(fee_by_tick.keys()))
-        fees_array = np.array([fee_by_tick[tick] for tick in ticks])
+        ticks = np.fromiter(fee_by_tick.keys(), dtype=np.int64, count=len(fee_by_tick))
+        ticks.sort()
+        sorted_ticks = ticks.tolist()
+        # Stream the (usdc, weth) pairs flat into one float buffer
+        fees_array = np.fromiter(
+            chain.from_iterable(map(fee_by_tick.__getitem__, sorted_ticks)),
+            dtype=np.float64,
+            count=2 * len(sorted_ticks)
+        ).reshape(-1, 2)
         usdc_fees = fees_array[:, 0]
-        weth_fees = fees_array[:, 1]
         
-        # Convert WETH fees to USDC for total view
-        weth_fees_in_usdc = weth_fees * eth_price
+        # Convert WETH fees to USDC for total view; derive every series and
+        # total used by the four panels here, once
+        weth_fees_in_usdc = fees_array[:, 1] * eth_price
         total_fees_usdc = usdc_fees + weth_fees_in_usdc
+        cumulative_fees = total_fees_usdc.cumsum()
+        total_usdc = usdc_fees.sum()
+        total_weth_usdc = weth_fees_in_usdc.sum()
         
         # Create figure with subplots
-        fig, axes = plt.subplots(2, 2, figsize=(16, 10))
+        fig = self._get_fig((16, 10))
+        axes = fig.subplots(2, 2)
         fig.suptitle('Fee Analysis Dashboard', fontsize=18, fontweight='bold', y=0.98)
         
         # 1. Total fees by tick (top left)
         ax1 = axes[0, 0]
-        bars = ax1.bar(ticks, total_fees_usdc, color=self.colors['success'], 
-                       alpha=0.8, edgecolor='none')
         
-        # Highlight highest earning ticks
+        # Highlight highest earning tick via per-bar style arrays, so all bars
+        # are styled in the single bar() call
         max_fee_idx = np.argmax(total_fees_usdc)
-        bars[max_fee_idx].set_color(self.colors['warning'])
-        bars[max_fee_idx].set_edgecolor(self.colors['dark'])
-        bars[max_fee_idx].set_linewidth(2)
+        bar_colors = [self.colors['success']] * ticks.size
+        bar_colors[max_fee_idx] = self.colors['warning']
+        bar_edges = ['none'] * ticks.size
+        bar_edges[max_fee_idx] = self.colors['dark']
+        bar_widths = np.zeros(ticks.size)
+        bar_widths[max_fee_idx] = 2
+        
+        ax1.bar(ticks, total_fees_usdc, color=bar_colors, alpha=0.8,
+                edgecolor=bar_edges, linewidth=bar_widths)
         
         ax1.set_title('Total Fee Distribution (USDC)', fontsize=14, fontweight='bold')
         ax1.set_xlabel('Tick')
@@ -195,7 +310,6 @@ class Visualizer:
         
         # 2. Cumulative fees (top right)
         ax2 = axes[0, 1]
-        cumulative_fees = np.cumsum(total_fees_usdc)
         ax2.fill_between(ticks, cumulative_fees, alpha=0.3, color=self.colors['info'])
         ax2.plot(ticks, cumulative_fees, color=self.colors['info'], linewidth=3)
         ax2.set_title('Cumulative Fee Earnings', fontsize=14, fontweight='bold')
@@ -212,26 +326,22 @@ class Visualizer:
         
         # 3. USDC vs WETH fees (bottom left)
         ax3 = axes[1, 0]
-        x = np.arange(len(ticks))
         width = 0.35
         
-        bars1 = ax3.bar(x - width/2, usdc_fees, width, label='USDC Fees',
+        bars1 = ax3.bar(ticks - width/2, usdc_fees, width, label='USDC Fees',
                        color=self.colors['primary'], alpha=0.8)
-        bars2 = ax3.bar(x + width/2, weth_fees_in_usdc, width, label='WETH Fees (in USDC)',
+        bars2 = ax3.bar(ticks + width/2, weth_fees_in_usdc, width, label='WETH Fees (in USDC)',
                        color=self.colors['secondary'], alpha=0.8)
         
         ax3.set_title('Fee Breakdown by Asset', fontsize=14, fontweight='bold')
-        ax3.set_xlabel('Tick Index')
+        ax3.set_xlabel('Tick')
         ax3.set_ylabel('Fees (USDC)')
-        ax3.set_xticks(x[::max(1, len(x)//10)])  # Show every 10th tick
-        ax3.set_xticklabels(ticks[::max(1, len(x)//10)])
+        ax3.xaxis.set_major_locator(MaxNLocator(10, integer=True))  # ~10 tick labels
         ax3.legend()
         ax3.grid(True, alpha=0.3)
         
         # 4. Fee composition pie chart (bottom right)
         ax4 = axes[1, 1]
-        total_usdc = np.sum(usdc_fees)
-        total_weth_usdc = np.sum(weth_fees_in_usdc)
         
         sizes = [total_usdc, total_weth_usdc]
         labels = [f'USDC\n${total_usdc:,.2f}', f'WETH\n${total_weth_usdc:,.2f}']
@@ -252,9 +362,8 @@ class Visualizer:
         
         ax4.set_title('Fee Composition', fontsize=14, fontweight='bold')
         
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white',
+                    pil_kwargs=PNG_PIL_KWARGS)
     
     def plot_position_value_chart(
         self,
@@ -262,7 +371,8 @@ class Visualizer:
         output_path: str
     ):
         """Create a comprehensive position value chart."""
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+        fig = self._get_fig((16, 6))
+        ax1, ax2 = fig.subplots(1, 2)
         
         # Left chart: Value breakdown
         categories = ['Initial\nPortfolio', 'Final\nPosition', 'Fees\nEarned', 'Unused\nFunds', 'Final\nTotal']
@@ -280,10 +390,8 @@ class Visualizer:
         bars = ax1.bar(categories, values, color=colors_list, alpha=0.8, edgecolor='white', linewidth=2)
         
         # Add value labels on bars
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height + 1000,
-                    f'${value:,.0f}', ha='center', va='bottom', fontweight='bold')
+        ax1.bar_label(bars, labels=[f'${value:,.0f}' for value in values],
+                      padding=3, fontweight='bold')
         
         ax1.set_title('Portfolio Value Breakdown', fontsize=14, fontweight='bold')
         ax1.set_ylabel('Value (USDC)', fontsize=12)
@@ -310,16 +418,12 @@ class Visualizer:
         bars2 = ax2.bar(metrics, metric_values, color=metric_colors, alpha=0.8, 
                        edgecolor='white', linewidth=2)
         
-        # Add value and percentage labels
-        for bar, value, metric in zip(bars2, metric_values, metrics):
-            height = bar.get_height()
-            pct = (value / 100000) * 100
-            label_y = height + 500 if height > 0 else height - 1500
-            
-            ax2.text(bar.get_x() + bar.get_width()/2., label_y,
-                    f'${abs(value):,.0f}\n({pct:+.2f}%)', 
-                    ha='center', va='bottom' if height > 0 else 'top', 
-                    fontweight='bold', fontsize=10)
+        # Add value and percentage labels; bar_label puts negative bars' labels below
+        ax2.bar_label(
+            bars2,
+            labels=[f'${abs(value):,.0f}\n({value / 100000 * 100:+.2f}%)' for value in metric_values],
+            padding=3, fontweight='bold', fontsize=10
+        )
         
         ax2.set_title('Performance Metrics', fontsize=14, fontweight='bold')
         ax2.set_ylabel('Value (USDC)', fontsize=12)
@@ -327,21 +431,49 @@ class Visualizer:
         ax2.axhline(y=0, color='black', linewidth=1)
         
         # Set y-axis to show both positive and negative
-        y_max = max(abs(min(metric_values)), max(metric_values)) * 1.3
+        y_max = np.abs(metric_values).max() * 1.3
         ax2.set_ylim(-y_max, y_max)
         
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white',
+                    pil_kwargs=PNG_PIL_KWARGS)
+    
+    def render_all(self, *charts: Callable[['Visualizer'], None], max_workers: int = 3):
+        """Render independent PNG charts concurrently in worker processes.
+        
+        Each chart is a picklable callable taking a Visualizer, usually a
+        partial of a plot method, e.g.
+        ``partial(Visualizer.plot_position_value_chart, analysis_results=..., output_path=...)``.
+        Each worker builds its own Visualizer, so only the plot arguments are
+        pickled. Workers are spawned, not forked: callers may already run
+        threads (asyncio.to_thread, aiohttp) whose held locks a fork would copy.
+        
+        Args:
+            charts: Callables drawing one chart each on the given Visualizer
+            max_workers: Maximum number of worker processes
+        """
+        if not charts:
+            return
+        
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(charts)),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_render_worker
+        ) as executor:
+            futures = [executor.submit(_render_chart, chart) for chart in charts]
+            # Surface the first worker failure
+            for future in futures:
+                future.result()
     
     def _fig_to_base64(self, fig):
         """Convert matplotlib figure to base64 string."""
         buf = BytesIO()
-        fig.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        buf.close()
-        return img_base64
+        # Screen resolution: a 12in-wide chart renders ~1150px, which fills the
+        # report's content column. Higher DPI only grows the encode time and
+        # the base64 blob pasted into the HTML; the standalone PNGs keep 300.
+        fig.savefig(buf, format='png', dpi=96, bbox_inches='tight',
+                    pil_kwargs=PNG_PIL_KWARGS)
+        # Encode straight from the buffer without copying it out first
+        return base64.b64encode(buf.getbuffer()).decode('ascii')
     
     def generate_summary_report(
         self,
@@ -356,12 +488,188 @@ class Visualizer:
         # Create mini charts for the report
         fig_summary = self._create_summary_chart(analysis_results)
         summary_chart_b64 = self._fig_to_base64(fig_summary)
-        plt.close(fig_summary)
         
-        # Determine performance class
-        pnl_class = 'positive' if analysis_results['pnl'] >= 0 else 'negative'
+        # Bind report values to locals once
+        pnl = analysis_results['pnl']
+        pnl_pct = analysis_results['pnl_pct']
+        total_fees_usdc = analysis_results['total_fees_usdc']
+        final_total_value = analysis_results['final_total_value']
+        impermanent_loss = analysis_results['impermanent_loss']
+        impermanent_loss_pct = analysis_results['impermanent_loss_pct']
+        eth_price_start = analysis_results['eth_price_start']
+        eth_price_end = analysis_results['eth_price_end']
+        initial_usdc_in_position = analysis_results['initial_usdc_in_position']
+        final_usdc = analysis_results['final_usdc']
+        fees_usdc = analysis_results['fees_usdc']
+        initial_weth_in_position = analysis_results['initial_weth_in_position']
+        final_weth = analysis_results['final_weth']
+        fees_weth = analysis_results['fees_weth']
+        
+        # Determine performance and status classes once
+        pnl_class = 'positive' if pnl >= 0 else 'negative'
+        eth_class = 'positive' if eth_price_end > eth_price_start else 'negative'
+        in_range_start = position.tick_lower <= pool_state_start.tick <= position.tick_upper
+        in_range_end = position.tick_lower <= pool_state_end.tick <= position.tick_upper
+        usdc_change = final_usdc + fees_usdc - initial_usdc_in_position
+        weth_change = final_weth + fees_weth - initial_weth_in_position
+        usdc_class = 'positive' if usdc_change >= 0 else 'negative'
+        weth_class = 'positive' if weth_change >= 0 else 'negative'
+        
+        # Format values shown more than once
+        pnl_text = f"${pnl:,.2f}"
+        pnl_pct_text = f"{pnl_pct:+.2f}%"
+        fees_text = f"${total_fees_usdc:,.2f}"
+        fees_pct_text = f"{(total_fees_usdc / 100000 * 100):.2f}%"
+        
+        # Values the template needs beyond the bound locals
+        context = dict(
+            generated_at=datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+            pnl_text=pnl_text,
+            pnl_pct_text=pnl_pct_text,
+            pnl_class=pnl_class,
+            fees_text=fees_text,
+            fees_pct_text=fees_pct_text,
+            final_total_value=final_total_value,
+            block_span=pool_state_end.block_number - pool_state_start.block_number,
+            start_block=pool_state_start.block_number,
+            end_block=pool_state_end.block_number,
+            tick_width=position.tick_upper - position.tick_lower + 1,
+            tick_lower=position.tick_lower,
+            tick_upper=position.tick_upper,
+            liquidity_b=position.liquidity / 1e9,
+            eth_price_start=eth_price_start,
+            eth_price_end=eth_price_end,
+            eth_change_pct=(eth_price_end - eth_price_start) / eth_price_start * 100,
+            eth_class=eth_class,
+            tick_start=pool_state_start.tick,
+            tick_end=pool_state_end.tick,
+            tick_change=pool_state_end.tick - pool_state_start.tick,
+            status_start='In Range' if in_range_start else 'Out of Range',
+            status_end='In Range' if in_range_end else 'Out of Range',
+            initial_usdc_in_position=initial_usdc_in_position,
+            final_usdc=final_usdc,
+            fees_usdc=fees_usdc,
+            usdc_change=usdc_change,
+            usdc_class=usdc_class,
+            initial_weth_in_position=initial_weth_in_position,
+            final_weth=final_weth,
+            fees_weth=fees_weth,
+            weth_change=weth_change,
+            weth_class=weth_class,
+            summary_chart_b64=summary_chart_b64,
+            impermanent_loss=impermanent_loss,
+            impermanent_loss_pct=impermanent_loss_pct,
+            il_impact_pct=abs(impermanent_loss / 100000 * 100),
+            insights_html=self._generate_insights(analysis_results, position, pool_state_start, pool_state_end),
+        )
+        html_body = _REPORT_BODY.format_map(context)
+        
+        # The static head is encoded once at import; only the body per report
+        with open(output_path, 'wb') as f:
+            f.write(_REPORT_HEAD_BYTES)
+            f.write(html_body.encode('utf-8'))
+    
+    def _create_summary_chart(self, analysis_results: Dict[str, Any]):
+        """Create a summary chart for the HTML report."""
+        ax1, ax2 = self._get_summary_axes()
+        
+        # Left: Portfolio composition
+        sizes = [
+            abs(analysis_results['final_value_usdc']),
+            abs(analysis_results['total_fees_usdc']),
+            abs(analysis_results['unused_value'])
+        ]
+        # Percentages are formatted here into the labels; no autopct pass
+        total = sum(sizes)
+        labels = [
+            f"{label}\n{100 * size / total:.1f}%"
+            for label, size in zip(['Position\nValue', 'Fees\nEarned', 'Unused\nFunds'], sizes)
+        ]
+        colors = [self.colors['primary'], self.colors['success'], self.colors['info']]
+        
+        wedges, texts = ax1.pie(sizes, labels=labels, colors=colors, startangle=45)
+        
+        for text in texts:
+            text.set_fontsize(10)
+        
+        ax1.set_title('Final Portfolio Composition', fontsize=12, fontweight='bold', pad=20)
+        
+        # Right: P&L waterfall
+        categories = ['Initial', 'IL', 'Fees', 'Final']
+        values = [100000, -abs(analysis_results['impermanent_loss']), 
+                 analysis_results['total_fees_usdc'], analysis_results['pnl']]
+        
+        # Calculate cumulative values for waterfall
+        cumulative = np.array([100000, 100000 + values[1], 100000 + values[1] + values[2],
+                               100000 + analysis_results['pnl']])
+        
+        # Create waterfall effect in one call: the end bars stand on zero,
+        # the steps span between consecutive cumulative values
+        steps = np.array(values[1:3])
+        heights = np.array([values[0], 0, 0, cumulative[3]], dtype=float)
+        heights[1:3] = np.abs(steps)
+        bottoms = np.zeros(4)
+        bottoms[1:3] = np.minimum(cumulative[:2], cumulative[1:3])
+        step_colors = np.array([self.colors['danger'], self.colors['success']])
+        bar_colors = [self.colors['dark'], *step_colors[(steps >= 0).astype(int)],
+                      self.colors['warning'] if cumulative[3] >= 100000 else self.colors['danger']]
+        ax2.bar(categories, heights, bottom=bottoms, color=bar_colors, alpha=0.8)
+        
+        # Add connectors
+        for i in range(len(categories) - 1):
+            ax2.plot([i, i+1], [cumulative[i+1], cumulative[i+1]], 
+                    'k--', alpha=0.5, linewidth=1)
+        
+        ax2.set_title('P&L Waterfall Analysis', fontsize=12, fontweight='bold', pad=20)
+        ax2.set_ylabel('Portfolio Value (USDC)')
+        ax2.axhline(y=100000, color='black', linestyle=':', alpha=0.5)
+        ax2.set_ylim(cumulative.min() * 0.98, cumulative.max() * 1.02)
         
-        html_content = f"""
+        return ax1.figure
+    
+    def _generate_insights(self, analysis_results: Dict[str, Any], position: Position, 
+                          pool_state_start: PoolState, pool_state_end: PoolState) -> str:
+        """Generate intelligent insights based on analysis results."""
+        # Bind report values to locals once
+        pnl = analysis_results['pnl']
+        pnl_pct = analysis_results['pnl_pct']
+        impermanent_loss_pct = analysis_results['impermanent_loss_pct']
+        total_fees_usdc = analysis_results['total_fees_usdc']
+        initial_usdc_in_position = analysis_results['initial_usdc_in_position']
+        initial_weth_in_position = analysis_results['initial_weth_in_position']
+        eth_price_start = analysis_results['eth_price_start']
+        
+        # Insights are written straight into one buffer, newline-separated
+        buf = StringIO()
+        
+        # Performance insight
+        if pnl > 0:
+            buf.write(_INSIGHT_PROFIT.format(pnl_pct=pnl_pct, impermanent_loss_pct=impermanent_loss_pct))
+        else:
+            buf.write(_INSIGHT_LOSS.format(loss_pct=abs(pnl_pct), impermanent_loss_pct=impermanent_loss_pct))
+        
+        # Fee efficiency and range efficiency
+        fee_roi, range_efficiency = _insight_metrics(
+            total_fees_usdc,
+            initial_usdc_in_position + initial_weth_in_position * eth_price_start,
+            position.tick_lower, position.tick_upper,
+            pool_state_start.tick, pool_state_end.tick
+        )
+        
+        if fee_roi > 0.5:
+            buf.write('\n')
+            buf.write(_INSIGHT_FEES.format(fee_roi=fee_roi))
+        
+        # Range efficiency
+        buf.write('\n')
+        buf.write(_INSIGHT_RANGE.format(range_efficiency=range_efficiency))
+        
+        return buf.getvalue()
+
+
+# Static <head> of the HTML report, kept out of the body template so only the
+# dynamic body is formatted per report
+_REPORT_HEAD = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -369,118 +677,118 @@ class Visualizer:
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Uniswap V3 Position Analysis Report</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
             min-height: 100vh;
             padding: 20px;
             line-height: 1.6;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 20px;
             box-shadow: 0 20px 60px rgba(0,0,0,0.1);
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 40px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             font-weight: 700;
-        }}
+        }
         
-        .header .subtitle {{
+        .header .subtitle {
             font-size: 1.2em;
             opacity: 0.9;
-        }}
+        }
         
-        .timestamp {{
+        .timestamp {
             margin-top: 15px;
             font-size: 0.9em;
             opacity: 0.8;
-        }}
+        }
         
-        .content {{
+        .content {
             padding: 40px;
-        }}
+        }
         
-        .section {{
+        .section {
             margin-bottom: 40px;
-        }}
+        }
         
-        .section h2 {{
+        .section h2 {
             color: #2c3e50;
             font-size: 1.8em;
             margin-bottom: 20px;
             padding-bottom: 10px;
             border-bottom: 3px solid #3498db;
             display: inline-block;
-        }}
+        }
         
-        .metrics-grid {{
+        .metrics-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-bottom: 30px;
-        }}
+        }
         
-        .metric-card {{
+        .metric-card {
             background: #f8f9fa;
             border-radius: 10px;
             padding: 20px;
             text-align: center;
             transition: transform 0.3s ease, box-shadow 0.3s ease;
             border: 1px solid #e9ecef;
-        }}
+        }
         
-        .metric-card:hover {{
+        .metric-card:hover {
             transform: translateY(-5px);
             box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-        }}
+        }
         
-        .metric-label {{
+        .metric-label {
             font-size: 0.9em;
             color: #6c757d;
             margin-bottom: 5px;
             text-transform: uppercase;
             letter-spacing: 1px;
-        }}
+        }
         
-        .metric-value {{
+        .metric-value {
             font-size: 1.8em;
             font-weight: 700;
             color: #2c3e50;
-        }}
+        }
         
-        .positive {{
+        .positive {
             color: #27ae60 !important;
-        }}
+        }
         
-        .negative {{
+        .negative {
             color: #e74c3c !important;
-        }}
+        }
         
-        .warning {{
+        .warning {
             color: #f39c12 !important;
-        }}
+        }
         
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
             margin-top: 20px;
@@ -488,9 +796,9 @@ class Visualizer:
             border-radius: 10px;
             overflow: hidden;
             box-shadow: 0 5px 20px rgba(0,0,0,0.05);
-        }}
+        }
         
-        th {{
+        th {
             background: #3498db;
             color: white;
             padding: 15px;
@@ -499,80 +807,80 @@ class Visualizer:
             text-transform: uppercase;
             font-size: 0.9em;
             letter-spacing: 0.5px;
-        }}
+        }
         
-        td {{
+        td {
             padding: 15px;
             border-bottom: 1px solid #ecf0f1;
-        }}
+        }
         
-        tr:hover {{
+        tr:hover {
             background: #f8f9fa;
-        }}
+        }
         
-        tr:last-child td {{
+        tr:last-child td {
             border-bottom: none;
-        }}
+        }
         
-        .chart-container {{
+        .chart-container {
             margin: 30px 0;
             text-align: center;
-        }}
+        }
         
-        .chart-container img {{
+        .chart-container img {
             max-width: 100%;
             border-radius: 10px;
             box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-        }}
+        }
         
-        .alert {{
+        .alert {
             padding: 15px 20px;
             border-radius: 10px;
             margin: 20px 0;
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .alert-info {{
+        .alert-info {
             background: #e3f2fd;
             border-left: 5px solid #2196f3;
             color: #1976d2;
-        }}
+        }
         
-        .alert-success {{
+        .alert-success {
             background: #e8f5e9;
             border-left: 5px solid #4caf50;
             color: #388e3c;
-        }}
+        }
         
-        .alert-warning {{
+        .alert-warning {
             background: #fff3e0;
             border-left: 5px solid #ff9800;
             color: #f57c00;
-        }}
+        }
         
-        .footer {{
+        .footer {
             background: #2c3e50;
             color: white;
             padding: 30px;
             text-align: center;
             font-size: 0.9em;
-        }}
+        }
         
-        .footer a {{
+        .footer a {
             color: #3498db;
             text-decoration: none;
-        }}
+        }
         
-        .summary-stats {{
+        .summary-stats {
             display: flex;
             justify-content: space-around;
             flex-wrap: wrap;
             gap: 20px;
             margin: 30px 0;
-        }}
+        }
         
-        .stat-box {{
+        .stat-box {
             flex: 1;
             min-width: 200px;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -580,40 +888,46 @@ class Visualizer:
             padding: 25px;
             border-radius: 15px;
             text-align: center;
-        }}
+        }
         
-        .stat-box .value {{
+        .stat-box .value {
             font-size: 2.5em;
             font-weight: 700;
             margin: 10px 0;
-        }}
+        }
         
-        .stat-box .label {{
+        .stat-box .label {
             font-size: 1em;
             opacity: 0.9;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .metrics-grid {{
+        @media (max-width: 768px) {
+            .metrics-grid {
                 grid-template-columns: 1fr;
-            }}
+            }
             
-            .header h1 {{
+            .header h1 {
                 font-size: 2em;
-            }}
+            }
             
-            .content {{
+            .content {
                 padding: 20px;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
-<body>
+"""
+_REPORT_HEAD_BYTES = _REPORT_HEAD.encode('utf-8')
+
+
+# Report body, filled per report with str.format_map; the template is
+# parsed once here instead of rebuilding f-string fragments each call
+_REPORT_BODY = """<body>
     <div class="container">
         <div class="header">
             <h1>🦄 Uniswap V3 Position Analysis</h1>
             <div class="subtitle">Comprehensive Performance Report</div>
-            <div class="timestamp">Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</div>
+            <div class="timestamp">Generated: {generated_at}</div>
         </div>
         
         <div class="content">
@@ -621,17 +935,17 @@ class Visualizer:
             <div class="summary-stats">
                 <div class="stat-box">
                     <div class="label">Total Return</div>
-                    <div class="value">{analysis_results['pnl_pct']:+.2f}%</div>
-                    <div class="label">${analysis_results['pnl']:,.2f}</div>
+                    <div class="value">{pnl_pct_text}</div>
+                    <div class="label">{pnl_text}</div>
                 </div>
                 <div class="stat-box">
                     <div class="label">Fees Earned</div>
-                    <div class="value">${analysis_results['total_fees_usdc']:,.2f}</div>
-                    <div class="label">{(analysis_results['total_fees_usdc'] / 100000 * 100):.2f}% of initial</div>
+                    <div class="value">{fees_text}</div>
+                    <div class="label">{fees_pct_text} of initial</div>
                 </div>
                 <div class="stat-box">
                     <div class="label">Final Value</div>
-                    <div class="value">${analysis_results['final_total_value']:,.2f}</div>
+                    <div class="value">${final_total_value:,.2f}</div>
                     <div class="label">from $100,000</div>
                 </div>
             </div>
@@ -647,17 +961,17 @@ class Visualizer:
                     </div>
                     <div class="metric-card">
                         <div class="metric-label">Block Range</div>
-                        <div class="metric-value">{pool_state_end.block_number - pool_state_start.block_number:,}</div>
-                        <div class="metric-label">{pool_state_start.block_number} → {pool_state_end.block_number}</div>
+                        <div class="metric-value">{block_span:,}</div>
+                        <div class="metric-label">{start_block} → {end_block}</div>
                     </div>
                     <div class="metric-card">
                         <div class="metric-label">Tick Range</div>
-                        <div class="metric-value">{position.tick_upper - position.tick_lower + 1}</div>
-                        <div class="metric-label">{position.tick_lower} → {position.tick_upper}</div>
+                        <div class="metric-value">{tick_width}</div>
+                        <div class="metric-label">{tick_lower} → {tick_upper}</div>
                     </div>
                     <div class="metric-card">
                         <div class="metric-label">Liquidity</div>
-                        <div class="metric-value">{position.liquidity/1e9:.2f}B</div>
+                        <div class="metric-value">{liquidity_b:.2f}B</div>
                         <div class="metric-label">Position Liquidity</div>
                     </div>
                 </div>
@@ -675,22 +989,22 @@ class Visualizer:
                     </tr>
                     <tr>
                         <td><strong>ETH Price</strong></td>
-                        <td>${analysis_results['eth_price_start']:,.2f}</td>
-                        <td>${analysis_results['eth_price_end']:,.2f}</td>
-                        <td class="{'positive' if analysis_results['eth_price_end'] > analysis_results['eth_price_start'] else 'negative'}">
-                            {((analysis_results['eth_price_end'] - analysis_results['eth_price_start']) / analysis_results['eth_price_start'] * 100):+.2f}%
+                        <td>${eth_price_start:,.2f}</td>
+                        <td>${eth_price_end:,.2f}</td>
+                        <td class="{eth_class}">
+                            {eth_change_pct:+.2f}%
                         </td>
                     </tr>
                     <tr>
                         <td><strong>Pool Tick</strong></td>
-                        <td>{pool_state_start.tick:,}</td>
-                        <td>{pool_state_end.tick:,}</td>
-                        <td>{pool_state_end.tick - pool_state_start.tick:+,}</td>
+                        <td>{tick_start:,}</td>
+                        <td>{tick_end:,}</td>
+                        <td>{tick_change:+,}</td>
                     </tr>
                     <tr>
                         <td><strong>Position Status</strong></td>
-                        <td>{'In Range' if pool_state_start.tick >= position.tick_lower and pool_state_start.tick <= position.tick_upper else 'Out of Range'}</td>
-                        <td>{'In Range' if pool_state_end.tick >= position.tick_lower and pool_state_end.tick <= position.tick_upper else 'Out of Range'}</td>
+                        <td>{status_start}</td>
+                        <td>{status_end}</td>
                         <td>-</td>
                     </tr>
                 </table>
@@ -709,20 +1023,20 @@ class Visualizer:
                     </tr>
                     <tr>
                         <td><strong>USDC</strong></td>
-                        <td>{analysis_results['initial_usdc_in_position']:,.2f}</td>
-                        <td>{analysis_results['final_usdc']:,.2f}</td>
-                        <td class="positive">+{analysis_results['fees_usdc']:,.2f}</td>
-                        <td class="{'positive' if (analysis_results['final_usdc'] + analysis_results['fees_usdc'] - analysis_results['initial_usdc_in_position']) >= 0 else 'negative'}">
-                            {(analysis_results['final_usdc'] + analysis_results['fees_usdc'] - analysis_results['initial_usdc_in_position']):+,.2f}
+                        <td>{initial_usdc_in_position:,.2f}</td>
+                        <td>{final_usdc:,.2f}</td>
+                        <td class="positive">+{fees_usdc:,.2f}</td>
+                        <td class="{usdc_class}">
+                            {usdc_change:+,.2f}
                         </td>
                     </tr>
                     <tr>
                         <td><strong>WETH</strong></td>
-                        <td>{analysis_results['initial_weth_in_position']:.6f}</td>
-                        <td>{analysis_results['final_weth']:.6f}</td>
-                        <td class="positive">+{analysis_results['fees_weth']:.6f}</td>
-                        <td class="{'positive' if (analysis_results['final_weth'] + analysis_results['fees_weth'] - analysis_results['initial_weth_in_position']) >= 0 else 'negative'}">
-                            {(analysis_results['final_weth'] + analysis_results['fees_weth'] - analysis_results['initial_weth_in_position']):+.6f}
+                        <td>{initial_weth_in_position:.6f}</td>
+                        <td>{final_weth:.6f}</td>
+                        <td class="positive">+{fees_weth:.6f}</td>
+                        <td class="{weth_class}">
+                            {weth_change:+.6f}
                         </td>
                     </tr>
                 </table>
@@ -744,21 +1058,21 @@ class Visualizer:
                     </tr>
                     <tr>
                         <td><strong>Impermanent Loss</strong></td>
-                        <td class="negative">${analysis_results['impermanent_loss']:,.2f}</td>
-                        <td class="negative">{analysis_results['impermanent_loss_pct']:.2f}%</td>
-                        <td class="negative">-{abs(analysis_results['impermanent_loss'] / 100000 * 100):.2f}%</td>
+                        <td class="negative">${impermanent_loss:,.2f}</td>
+                        <td class="negative">{impermanent_loss_pct:.2f}%</td>
+                        <td class="negative">-{il_impact_pct:.2f}%</td>
                     </tr>
                     <tr>
                         <td><strong>Trading Fees</strong></td>
-                        <td class="positive">${analysis_results['total_fees_usdc']:,.2f}</td>
-                        <td class="positive">+{(analysis_results['total_fees_usdc'] / 100000 * 100):.2f}%</td>
-                        <td class="positive">+{(analysis_results['total_fees_usdc'] / 100000 * 100):.2f}%</td>
+                        <td class="positive">{fees_text}</td>
+                        <td class="positive">+{fees_pct_text}</td>
+                        <td class="positive">+{fees_pct_text}</td>
                     </tr>
                     <tr>
                         <td><strong>Net Result</strong></td>
-                        <td class="{pnl_class}">${analysis_results['pnl']:,.2f}</td>
-                        <td class="{pnl_class}">{analysis_results['pnl_pct']:+.2f}%</td>
-                        <td class="{pnl_class}">{analysis_results['pnl_pct']:+.2f}%</td>
+                        <td class="{pnl_class}">{pnl_text}</td>
+                        <td class="{pnl_class}">{pnl_pct_text}</td>
+                        <td class="{pnl_class}">{pnl_pct_text}</td>
                     </tr>
                 </table>
             </div>
@@ -767,7 +1081,7 @@ class Visualizer:
             <div class="section">
                 <h2>💡 Key Insights</h2>
                 
-                {self._generate_insights(analysis_results, position, pool_state_start, pool_state_end)}
+                {insights_html}
             </div>
             
             <!-- Generated Visualizations -->
@@ -792,122 +1106,35 @@ class Visualizer:
 </body>
 </html>
 """
-        
-        with open(output_path, 'w') as f:
-            f.write(html_content)
-    
-    def _create_summary_chart(self, analysis_results: Dict[str, Any]):
-        """Create a summary chart for the HTML report."""
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-        
-        # Left: Portfolio composition
-        sizes = [
-            abs(analysis_results['final_value_usdc']),
-            abs(analysis_results['total_fees_usdc']),
-            abs(analysis_results['unused_value'])
-        ]
-        labels = ['Position\nValue', 'Fees\nEarned', 'Unused\nFunds']
-        colors = [self.colors['primary'], self.colors['success'], self.colors['info']]
-        
-        wedges, texts, autotexts = ax1.pie(sizes, labels=labels, colors=colors,
-                                           autopct='%1.1f%%', startangle=45)
-        
-        for text in texts:
-            text.set_fontsize(10)
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-        
-        ax1.set_title('Final Portfolio Composition', fontsize=12, fontweight='bold', pad=20)
-        
-        # Right: P&L waterfall
-        categories = ['Initial', 'IL', 'Fees', 'Final']
-        values = [100000, -abs(analysis_results['impermanent_loss']), 
-                 analysis_results['total_fees_usdc'], analysis_results['pnl']]
-        
-        # Calculate cumulative values for waterfall
-        cumulative = [100000]
-        cumulative.append(cumulative[0] + values[1])
-        cumulative.append(cumulative[1] + values[2])
-        cumulative.append(100000 + analysis_results['pnl'])
-        
-        # Create waterfall effect
-        for i in range(len(categories)):
-            if i == 0:
-                ax2.bar(categories[i], values[i], bottom=0, 
-                       color=self.colors['dark'], alpha=0.8)
-            elif i == len(categories) - 1:
-                ax2.bar(categories[i], cumulative[i], bottom=0,
-                       color=self.colors['warning'] if cumulative[i] >= 100000 else self.colors['danger'], 
-                       alpha=0.8)
-            else:
-                if values[i] >= 0:
-                    ax2.bar(categories[i], values[i], bottom=cumulative[i-1],
-                           color=self.colors['success'], alpha=0.8)
-                else:
-                    ax2.bar(categories[i], abs(values[i]), bottom=cumulative[i],
-                           color=self.colors['danger'], alpha=0.8)
-        
-        # Add connectors
-        for i in range(len(categories) - 1):
-            ax2.plot([i, i+1], [cumulative[i+1], cumulative[i+1]], 
-                    'k--', alpha=0.5, linewidth=1)
-        
-        ax2.set_title('P&L Waterfall Analysis', fontsize=12, fontweight='bold', pad=20)
-        ax2.set_ylabel('Portfolio Value (USDC)')
-        ax2.axhline(y=100000, color='black', linestyle=':', alpha=0.5)
-        ax2.set_ylim(min(cumulative) * 0.98, max(cumulative) * 1.02)
-        
-        plt.tight_layout()
-        return fig
-    
-    def _generate_insights(self, analysis_results: Dict[str, Any], position: Position, 
-                          pool_state_start: PoolState, pool_state_end: PoolState) -> str:
-        """Generate intelligent insights based on analysis results."""
-        insights = []
-        
-        # Performance insight
-        if analysis_results['pnl'] > 0:
-            insights.append(f"""
+
+
+# Insight fragments, filled per report with str.format
+_INSIGHT_PROFIT = """
                 <div class="alert alert-success">
                     <strong>✅ Profitable Position:</strong> Your position generated a 
-                    {analysis_results['pnl_pct']:.2f}% return, outperforming a simple hold strategy
-                    despite {analysis_results['impermanent_loss_pct']:.2f}% impermanent loss.
+                    {pnl_pct:.2f}% return, outperforming a simple hold strategy
+                    despite {impermanent_loss_pct:.2f}% impermanent loss.
                 </div>
-            """)
-        else:
-            insights.append(f"""
+            """
+
+_INSIGHT_LOSS = """
                 <div class="alert alert-warning">
                     <strong>⚠️ Negative Returns:</strong> The position resulted in a 
-                    {abs(analysis_results['pnl_pct']):.2f}% loss. Impermanent loss 
-                    ({analysis_results['impermanent_loss_pct']:.2f}%) exceeded fee earnings.
+                    {loss_pct:.2f}% loss. Impermanent loss 
+                    ({impermanent_loss_pct:.2f}%) exceeded fee earnings.
                 </div>
-            """)
-        
-        # Fee efficiency
-        fee_roi = (analysis_results['total_fees_usdc'] / 
-                  (analysis_results['initial_usdc_in_position'] + 
-                   analysis_results['initial_weth_in_position'] * analysis_results['eth_price_start'])) * 100
-        
-        if fee_roi > 0.5:
-            insights.append(f"""
+            """
+
+_INSIGHT_FEES = """
                 <div class="alert alert-info">
                     <strong>💰 Strong Fee Generation:</strong> Your position earned {fee_roi:.2f}% 
                     in fees relative to deployed capital, indicating good liquidity utilization.
                 </div>
-            """)
-        
-        # Range efficiency
-        ticks_in_range = sum(1 for tick in range(position.tick_lower, position.tick_upper + 1)
-                           if tick >= min(pool_state_start.tick, pool_state_end.tick) and 
-                           tick <= max(pool_state_start.tick, pool_state_end.tick))
-        range_efficiency = (ticks_in_range / (position.tick_upper - position.tick_lower + 1)) * 100
-        
-        insights.append(f"""
+            """
+
+_INSIGHT_RANGE = """
             <div class="alert alert-info">
                 <strong>📊 Range Efficiency:</strong> The price spent approximately {range_efficiency:.0f}% 
                 of the time within your position range, affecting fee generation potential.
             </div>
-        """)
-        
-        return '\n'.join(insights) 
\ No newline at end of file
+        """
@@ -0,0 +1,13 @@
+"""
+Shared helpers for the test suite.
+"""
+
+import math
+
+
+class CloseAssertMixin:
+    """Float comparisons for TestCase subclasses."""
+    
+    def _close(self, a, b, rel=1e-4):
+        """Assert a and b agree to a relative tolerance."""
+        self.assertTrue(math.isclose(a, b, rel_tol=rel), f"{a} != {b} within rel_tol={rel}")
@@ -5,31 +5,35 @@ Run all mathematical validation tests and report any issues found.
 
 import sys
 import subprocess
-import asyncio
 from pathlib import Path
 
-def run_test_file(test_file):
-    """Run a single test file and return results."""
-    print(f"\n{'='*60}")
-    print(f"Running {test_file}")
-    print('='*60)
-    
-    result = subprocess.run(
+def start_test_file(test_file):
+    """Start a test file in its own interpreter and return the process."""
+    return subprocess.Popen(
         [sys.executable, test_file],
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True
     )
+
+def report_test_file(test_file, process):
+    """Wait for a started test file, print its results and return success."""
+    stdout, stderr = process.communicate()
+    
+    print(f"\n{'='*60}")
+    print(f"Running {test_file}")
+    print('='*60)
     
-    if result.returncode == 0:
+    if process.returncode == 0:
         print("✅ All tests passed!")
     else:
         print("❌ Some tests failed!")
         print("\nSTDOUT:")
-        print(result.stdout)
+        print(stdout)
         print("\nSTDERR:")
-        print(result.stderr)
+        print(stderr)
     
-    return result.returncode == 0
+    return process.returncode == 0
 
 def main():
     """Run all math validation tests."""
@@ -44,22 +48,21 @@ def main():
     
     tests_dir = Path(__file__).parent
     
-    # Run the comprehensive math tests
-    all_passed = run_test_file(tests_dir / "test_mathematics_validation.py")
-    
-    # Also run existing related tests
-    print("\nRunning existing test suites...")
-    
-    test_files = [
-        "test_uniswap_v3.py",
-        "test_analysis.py"
+    # The comprehensive math tests plus existing related suites
+    test_paths = [tests_dir / "test_mathematics_validation.py"]
+    test_paths += [
+        tests_dir / test_file
+        for test_file in ("test_uniswap_v3.py", "test_analysis.py")
+        if (tests_dir / test_file).exists()
     ]
     
-    for test_file in test_files:
-        test_path = tests_dir / test_file
-        if test_path.exists():
-            passed = run_test_file(test_path)
-            all_passed = all_passed and passed
+    # The files are independent: run them concurrently, report in order
+    processes = [start_test_file(test_path) for test_path in test_paths]
+    results = [
+        report_test_file(test_path, process)
+        for test_path, process in zip(test_paths, processes)
+    ]
+    all_passed = all(results)
     
     print("\n" + "="*60)
     if all_passed:
@@ -121,7 +121,7 @@ async def test_fee_calculation_caching():
     ]
     
     # Test liquidity distribution
-    liquidity_distribution = {tick: 10000000000 for tick in range(200530, 200570)}
+    liquidity_distribution = dict.fromkeys(range(200530, 200570), 10000000000)
     
     print("Testing fee calculation caching...")
     start = time.time()
@@ -160,14 +160,14 @@ def test_vectorized_calculations():
     print("Testing vectorized calculations...")
     
     # Create large test data
-    tick_range = np.arange(200000, 201000)  # 1000 ticks
-    liquidity_dist = {tick: 1000000000 for tick in tick_range}
+    tick_range = np.arange(200000, 201000)  # 1000 contiguous ticks
+    liq_values = np.full(tick_range.shape, 1_000_000_000, dtype=np.int64)
     
-    # Test vectorized operations
+    # Test vectorized operations; contiguous ticks index by offset
     start = time.time()
     tick_array = np.arange(200100, 200200)
-    valid_ticks = tick_array[np.isin(tick_array, list(liquidity_dist.keys()))]
-    total_liquidities = np.array([liquidity_dist.get(t, 1) for t in valid_ticks])
+    valid_ticks = tick_array[(tick_array >= tick_range[0]) & (tick_array <= tick_range[-1])]
+    total_liquidities = liq_values[valid_ticks - tick_range[0]]
     our_shares = np.where(total_liquidities > 0, 500000000 / total_liquidities, 0)
     time_vectorized = time.time() - start
     
@@ -202,14 +202,16 @@ def test_visualization_performance():
     )
     
     # Large liquidity distribution
-    liquidity_dist = {tick: np.random.randint(1e8, 1e10) for tick in range(200500, 200600)}
+    dist_ticks = np.arange(200500, 200600)
+    dist_liquidity = np.random.randint(10**8, 10**10, size=len(dist_ticks), dtype=np.int64)
     
     print("Testing visualization data preparation...")
     start = time.time()
     
-    # Test vectorized data preparation
+    # Test vectorized data preparation; ticks outside the distribution get 0
     ticks = np.arange(200530, 200570)
-    total_liquidity = np.array([liquidity_dist.get(tick, 0) for tick in ticks])
+    idx = np.minimum(np.searchsorted(dist_ticks, ticks), len(dist_ticks) - 1)
+    total_liquidity = np.where(dist_ticks[idx] == ticks, dist_liquidity[idx], 0)
     position_liquidity = np.where(
         (ticks >= position.tick_lower) & (ticks <= position.tick_upper),
         position.liquidity,
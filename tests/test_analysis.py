@@ -3,24 +3,100 @@ Unit tests for the analysis module.
 """
 
 import unittest
+import asyncio
 from unittest.mock import Mock, MagicMock
+import numpy as np
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.analysis import PositionAnalyzer
+from src.analysis import PositionAnalyzer, FeeByTick, total_fees, swap_columns
 from src.uniswap import UniswapV3Calculator, Position
 from src.blockchain import PoolState, SwapEvent
+from tests.helpers import CloseAssertMixin
 
 
-class TestPositionAnalyzer(unittest.TestCase):
+def _make_liq_array(base, n, value):
+    """Uniform pool liquidity over ticks [base, base + n) as (base, array)."""
+    return base, np.full(n, value, dtype=np.int64)
+
+
+# Shared fixtures; Position, PoolState and SwapEvent are frozen, so tests can reuse them
+_POS_WIDE = Position(liquidity=1000000, tick_lower=100, tick_upper=200, amount0=1000, amount1=1)
+_POS_NARROW = Position(liquidity=1000000, tick_lower=100, tick_upper=110, amount0=1000, amount1=1)
+# 10% of a pool with 10e9 liquidity
+_POS_TENTH = Position(liquidity=1000000000, tick_lower=200540, tick_upper=200560, amount0=1000, amount1=0.5)
+_POS_ANALYZE = Position(
+    liquidity=1000000,
+    tick_lower=200540,
+    tick_upper=200560,
+    amount0=45000.0,  # USDC
+    amount1=22.5      # WETH
+)
+
+_SWAPS_1_ETH = [
+    # 1 USDC (assuming 6 decimals) for 1 ETH
+    SwapEvent.make(-1000000, 1000000000000000000, tick=150)
+]
+
+# Single swap: 1M USDC for 500 WETH, within _POS_TENTH's range
+_SWAPS_1M_USDC = [
+    SwapEvent.make(-1000000 * 10**6, 500 * 10**18, tick=200550, block_number=17618700)
+]
+
+# Swap that crosses multiple ticks
+_SWAPS_10_ETH = [
+    # 10 USDC for 10 ETH, ending in the middle of the range
+    SwapEvent.make(-10000000, 10000000000000000000, tick=105)
+]
+
+_POOL_STATE_START = PoolState(
+    sqrt_price_x96=1000000000000000000000,
+    tick=200550,
+    liquidity=10000000,
+    fee=500,
+    tick_spacing=10,
+    token0="0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+    token1="0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
+    block_number=17618642
+)
+
+_POOL_STATE_END = PoolState(
+    sqrt_price_x96=1100000000000000000000,
+    tick=200555,
+    liquidity=10000000,
+    fee=500,
+    tick_spacing=10,
+    token0="0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+    token1="0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
+    block_number=17618742
+)
+
+# Keys every analyze_position result must contain
+_EXPECTED_KEYS = frozenset({
+    'final_usdc', 'final_weth', 'final_value_usdc',
+    'impermanent_loss', 'impermanent_loss_pct',
+    'fees_usdc', 'fees_weth', 'total_fees_usdc',
+    'fee_by_tick', 'unused_usdc', 'unused_weth',
+    'unused_value', 'final_total_value', 'pnl', 'pnl_pct',
+    'eth_price_start', 'eth_price_end', 'position_liquidity',
+    'initial_usdc_in_position', 'initial_weth_in_position'
+})
+
+
+class TestPositionAnalyzer(CloseAssertMixin, unittest.TestCase):
     """Test cases for PositionAnalyzer."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calculator = UniswapV3Calculator()
-        self.analyzer = PositionAnalyzer(self.calculator)
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests; none of them are mutated."""
+        cls.calculator = UniswapV3Calculator()
+        cls.analyzer = PositionAnalyzer(cls.calculator)
+        
+        # Uniform liquidity over ticks 90-209, read-only so tests can share it
+        cls.LIQ_UNIFORM = _make_liq_array(90, 120, 10000000)
+        cls.LIQ_UNIFORM[1].flags.writeable = False
     
     def test_calculate_impermanent_loss(self):
         """Test impermanent loss calculation."""
@@ -55,93 +131,87 @@ class TestPositionAnalyzer(unittest.TestCase):
         # There should be some IL when price changes
         self.assertGreater(il_amount_2, 0)
         self.assertGreater(il_pct_2, 0)
+        
+        # The batch path matches the scalar path for both cases
+        il_amounts, il_pcts = self.analyzer.calculate_impermanent_loss_batch(
+            np.array([initial_usdc, initial_usdc]),
+            np.array([initial_weth, initial_weth]),
+            np.array([final_usdc, final_usdc_2]),
+            np.array([final_weth, final_weth_2]),
+            eth_price_start,
+            np.array([eth_price_end, eth_price_end_2])
+        )
+        
+        np.testing.assert_allclose(il_amounts, [il_amount, il_amount_2])
+        np.testing.assert_allclose(il_pcts, [il_pct, il_pct_2])
     
     def test_estimate_fees_from_swaps(self):
         """Test fee estimation from swap events."""
-        # Create position
-        position = Position(
-            liquidity=1000000,
-            tick_lower=100,
-            tick_upper=200,
-            amount0=1000,
-            amount1=1
-        )
-        
-        # Create liquidity distribution
-        liquidity_distribution = {tick: 10000000 for tick in range(90, 210)}
-        
-        # Create swap events
-        swap_events = [
-            SwapEvent(
-                sender="0x1",
-                recipient="0x2", 
-                amount0=-1000000,  # 1 USDC (assuming 6 decimals)
-                amount1=1000000000000000000,  # 1 ETH
-                sqrt_price_x96=0,
-                liquidity=0,
-                tick=150,
-                block_number=1,
-                transaction_hash="0xabc"
-            )
-        ]
+        position = _POS_WIDE
+        liquidity_distribution = self.LIQ_UNIFORM
+        swap_events = _SWAPS_1_ETH
         
         pool_fee = 500  # 0.05%
         
-        fee_by_tick = self.analyzer.estimate_fees_from_swaps(
+        fee_by_tick = asyncio.run(self.analyzer.estimate_fees_from_swaps(
             position, swap_events, liquidity_distribution, pool_fee
-        )
+        ))
         
         # Should have fees distributed across ticks
         self.assertGreater(len(fee_by_tick), 0)
+        self.assertIsInstance(fee_by_tick, FeeByTick)
+        self.assertEqual(list(fee_by_tick), list(range(position.tick_lower, position.tick_upper + 1)))
+        self.assertNotIn(position.tick_upper + 1, fee_by_tick)
         
         # Total fees should be reasonable
-        total_fee0 = sum(fees[0] for fees in fee_by_tick.values())
-        total_fee1 = sum(fees[1] for fees in fee_by_tick.values())
+        total_fee0, total_fee1 = total_fees(fee_by_tick)
         
         self.assertGreater(total_fee0, 0)
         self.assertGreater(total_fee1, 0)
     
+    def test_estimate_fees_from_swap_columns(self):
+        """Test that precomputed swap columns give the same fees as the events."""
+        columns = swap_columns(_SWAPS_10_ETH)
+        
+        for position in (_POS_WIDE, _POS_NARROW):
+            from_events = asyncio.run(self.analyzer.estimate_fees_from_swaps(
+                position, _SWAPS_10_ETH, self.LIQ_UNIFORM, 500
+            ))
+            from_columns = asyncio.run(self.analyzer.estimate_fees_from_swaps(
+                position, columns, self.LIQ_UNIFORM, 500
+            ))
+            self.assertEqual(dict(from_columns), dict(from_events))
+    
+    def test_estimate_fees_empty_range(self):
+        """Test that an inverted tick range earns no fees."""
+        position = Position(liquidity=1000000, tick_lower=110, tick_upper=100, amount0=1000, amount1=1)
+        
+        fee_by_tick = asyncio.run(self.analyzer.estimate_fees_from_swaps(
+            position, _SWAPS_10_ETH, self.LIQ_UNIFORM, 500
+        ))
+        
+        self.assertEqual(len(fee_by_tick), 0)
+        self.assertEqual(total_fees(fee_by_tick), (0.0, 0.0))
+    
     def test_fee_calculation_accuracy(self):
         """Test accurate fee calculation with known values."""
-        # Create position with 10% of pool liquidity
-        position = Position(
-            liquidity=1000000000,  # 1e9
-            tick_lower=200540,
-            tick_upper=200560,
-            amount0=1000,
-            amount1=0.5
-        )
+        # Position with 10% of pool liquidity
+        position = _POS_TENTH
         
         # Total liquidity is 10x our position
-        liquidity_distribution = {}
         total_liquidity = 10000000000  # 10e9
-        for tick in range(200530, 200570):
-            liquidity_distribution[tick] = total_liquidity
-        
-        # Single swap: 1M USDC for 500 WETH
-        swap_event = SwapEvent(
-            sender="0x123",
-            recipient="0x456",
-            amount0=-1000000 * 10**6,  # 1M USDC out
-            amount1=500 * 10**18,       # 500 WETH in
-            sqrt_price_x96=0,
-            liquidity=0,
-            tick=200550,  # Within our range
-            block_number=17618700,
-            transaction_hash="0xabc"
-        )
+        liquidity_distribution = _make_liq_array(200530, 40, total_liquidity)
         
         pool_fee = 500  # 0.05%
         
-        fee_by_tick = self.analyzer.estimate_fees_from_swaps(
+        fee_by_tick = asyncio.run(self.analyzer.estimate_fees_from_swaps(
             position,
-            [swap_event],
+            _SWAPS_1M_USDC,
             liquidity_distribution,
             pool_fee
-        )
+        ))
         
-        total_usdc_fees = sum(fees[0] for fees in fee_by_tick.values())
-        total_weth_fees = sum(fees[1] for fees in fee_by_tick.values())
+        total_usdc_fees, total_weth_fees = total_fees(fee_by_tick)
         
         # Expected calculations:
         # Pool fee rate = 0.0005 (0.05%)
@@ -151,43 +221,23 @@ class TestPositionAnalyzer(unittest.TestCase):
         # Expected USDC fees = 500 * 0.1 = 50 USDC
         # Expected WETH fees = 0.25 * 0.1 = 0.025 WETH
         
-        self.assertAlmostEqual(total_usdc_fees, 50.0, places=2)
-        self.assertAlmostEqual(total_weth_fees, 0.025, places=4)
+        self._close(total_usdc_fees, 50.0)
+        self._close(total_weth_fees, 0.025)
     
     def test_fee_distribution_across_ticks(self):
         """Test that fees are properly distributed across ticks."""
-        position = Position(
-            liquidity=1000000,
-            tick_lower=100,
-            tick_upper=110,
-            amount0=1000,
-            amount1=1
-        )
+        position = _POS_NARROW
         
         # Uniform liquidity
-        liquidity_distribution = {tick: 10000000 for tick in range(90, 120)}
-        
-        # Swap that crosses multiple ticks
-        swap_events = [
-            SwapEvent(
-                sender="0x1",
-                recipient="0x2",
-                amount0=-10000000,  # 10 USDC
-                amount1=10000000000000000000,  # 10 ETH
-                sqrt_price_x96=0,
-                liquidity=0,
-                tick=105,  # End in middle of range
-                block_number=1,
-                transaction_hash="0xabc"
-            )
-        ]
+        liquidity_distribution = self.LIQ_UNIFORM
+        swap_events = _SWAPS_10_ETH
         
         # Start from tick 100 (implicitly)
         pool_fee = 500
         
-        fee_by_tick = self.analyzer.estimate_fees_from_swaps(
+        fee_by_tick = asyncio.run(self.analyzer.estimate_fees_from_swaps(
             position, swap_events, liquidity_distribution, pool_fee
-        )
+        ))
         
         # Fees should be distributed from tick 100 to 105
         active_ticks = [t for t, fees in fee_by_tick.items() if fees[0] > 0 or fees[1] > 0]
@@ -201,51 +251,25 @@ class TestPositionAnalyzer(unittest.TestCase):
         avg_fee = sum(fees_per_tick) / len(fees_per_tick)
         
         for fee in fees_per_tick:
-            self.assertAlmostEqual(fee, avg_fee, places=6)
+            self._close(fee, avg_fee)
     
     def test_analyze_position(self):
         """Test complete position analysis."""
-        # Create test position
-        position = Position(
-            liquidity=1000000,
-            tick_lower=200540,
-            tick_upper=200560,
-            amount0=45000.0,  # USDC
-            amount1=22.5      # WETH
-        )
+        position = _POS_ANALYZE
         
-        # Create mock pool states
-        pool_state_start = PoolState(
-            sqrt_price_x96=1000000000000000000000,
-            tick=200550,
-            liquidity=10000000,
-            fee=500,
-            tick_spacing=10,
-            token0="0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
-            token1="0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
-            block_number=17618642
-        )
-        
-        pool_state_end = PoolState(
-            sqrt_price_x96=1100000000000000000000,
-            tick=200555,
-            liquidity=10000000,
-            fee=500,
-            tick_spacing=10,
-            token0="0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
-            token1="0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
-            block_number=17618742
-        )
+        # Mock pool states
+        pool_state_start = _POOL_STATE_START
+        pool_state_end = _POOL_STATE_END
         
         # Mock liquidity distribution and swap events
-        liquidity_distribution = {tick: 10000000 for tick in range(200530, 200571)}
+        liquidity_distribution = _make_liq_array(200530, 41, 10000000)
         swap_events = []  # Empty for simplicity
         
         eth_price_start = 2000.0
         eth_price_end = 2100.0
         
         # Analyze position
-        results = self.analyzer.analyze_position(
+        results = asyncio.run(self.analyzer.analyze_position(
             position,
             pool_state_start,
             pool_state_end,
@@ -253,21 +277,11 @@ class TestPositionAnalyzer(unittest.TestCase):
             swap_events,
             eth_price_start,
             eth_price_end
-        )
+        ))
         
         # Verify results structure
-        expected_keys = [
-            'final_usdc', 'final_weth', 'final_value_usdc',
-            'impermanent_loss', 'impermanent_loss_pct',
-            'fees_usdc', 'fees_weth', 'total_fees_usdc',
-            'fee_by_tick', 'unused_usdc', 'unused_weth',
-            'unused_value', 'final_total_value', 'pnl', 'pnl_pct',
-            'eth_price_start', 'eth_price_end', 'position_liquidity',
-            'initial_usdc_in_position', 'initial_weth_in_position'
-        ]
-        
-        for key in expected_keys:
-            self.assertIn(key, results)
+        missing = _EXPECTED_KEYS - results.keys()
+        self.assertFalse(missing, f"missing: {missing}")
         
         # Verify some basic properties
         self.assertEqual(results['eth_price_start'], eth_price_start)
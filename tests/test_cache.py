@@ -0,0 +1,133 @@
+"""
+Unit tests for the file cache.
+"""
+
+import unittest
+import asyncio
+import tempfile
+import time
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.cache import FileCache, CacheKeyBuilder
+
+
+class TestFileCache(unittest.TestCase):
+    """Test cases for FileCache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = FileCache(self.temp_dir.name, default_ttl=3600)
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        self.temp_dir.cleanup()
+
+    def test_set_and_get(self):
+        """Test that a stored value is returned on the next get."""
+        key = CacheKeyBuilder.pool_state_key("0xpool", 17618642)
+        value = {'tick': 200550, 'liquidity': 2**127}
+
+        async def run_test():
+            await self.cache.set(key, value)
+            return await self.cache.get(key)
+
+        self.assertEqual(asyncio.run(run_test()), value)
+
+    def test_raw_components_share_entry_with_key(self):
+        """Test that get_raw/set_raw address the same entry as the joined key."""
+        key = CacheKeyBuilder.pool_state_key("0xpool", 17618642)
+
+        async def run_test():
+            await self.cache.set_raw('pool_state', "0xpool", 17618642, value="raw")
+            from_key = await self.cache.get(key)
+            await self.cache.set(key, "keyed")
+            return from_key, await self.cache.get_raw('pool_state', "0xpool", 17618642)
+
+        self.assertEqual(asyncio.run(run_test()), ("raw", "keyed"))
+
+    def test_memory_layer_serves_hot_keys(self):
+        """Test that recent values are served from memory and evicted by LRU."""
+        cache = FileCache(self.temp_dir.name, memory_entries=1)
+
+        async def run_test():
+            await cache.set("a", 1)
+            await cache.set("b", 2)
+            # Remove the files so only the in-process layer can answer
+            for name in os.listdir(self.temp_dir.name):
+                os.remove(os.path.join(self.temp_dir.name, name))
+            return await cache.get("a"), await cache.get("b")
+
+        self.assertEqual(asyncio.run(run_test()), (None, 2))
+
+    def test_failed_write_is_not_served(self):
+        """Test that a value that could not be written to disk is not cached."""
+        async def run_test():
+            await self.cache.set("unpicklable", lambda: None)
+            return await self.cache.get("unpicklable")
+
+        self.assertIsNone(asyncio.run(run_test()))
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    def test_missing_key(self):
+        """Test that an unknown key is a cache miss."""
+        self.assertIsNone(asyncio.run(self.cache.get("missing")))
+
+    def test_expired_entry(self):
+        """Test that an expired entry is a miss and is removed from disk."""
+        async def run_test():
+            await self.cache.set("stale", 1, ttl=-1)
+            return await self.cache.get("stale")
+
+        self.assertIsNone(asyncio.run(run_test()))
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    def test_delete_and_clear(self):
+        """Test that deleted and cleared entries are no longer returned."""
+        async def run_test():
+            await self.cache.set("a", 1)
+            await self.cache.set("b", 2)
+            await self.cache.delete("a")
+            after_delete = (await self.cache.get("a"), await self.cache.get("b"))
+            await self.cache.clear()
+            return after_delete, await self.cache.get("b")
+
+        after_delete, after_clear = asyncio.run(run_test())
+
+        self.assertEqual(after_delete, (None, 2))
+        self.assertIsNone(after_clear)
+
+
+    def test_clear_during_set(self):
+        """Test that a clear racing a set leaves memory and disk in agreement."""
+        real_replace = os.replace
+
+        async def run_test():
+            loop = asyncio.get_running_loop()
+            clears = []
+
+            def replace_during_clear(src, dst):
+                # Start clear() while this write is still in flight
+                clears.append(asyncio.run_coroutine_threadsafe(self.cache.clear(), loop))
+                time.sleep(0.1)
+                real_replace(src, dst)
+
+            with patch('src.data.cache.os.replace', replace_during_clear):
+                await self.cache.set("a", 1)
+            await asyncio.wrap_future(clears[0])
+            from_disk = await FileCache(self.temp_dir.name).get("a")
+            return await self.cache.get("a"), from_disk
+
+        with self.assertNoLogs('src.data.cache', level='ERROR'):
+            from_memory, from_disk = asyncio.run(run_test())
+
+        self.assertEqual(from_memory, from_disk)
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
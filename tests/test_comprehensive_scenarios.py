@@ -5,13 +5,52 @@ Covers all major edge cases and real-world scenarios.
 
 import unittest
 import asyncio
-from unittest.mock import Mock, patch, MagicMock
 import numpy as np
-from decimal import Decimal
+from eth_abi import decode, encode
 
-from src.blockchain import DataFetcher, PoolState, SwapEvent
+from src.blockchain import (
+    DataFetcher, PoolState, SwapEvent,
+    SWAP_EVENT_COLUMNS, swap_events_to_frame, frame_to_swap_events
+)
+from src.blockchain.data_fetcher import (
+    MULTICALL3_ADDRESS, MULTICALL3_TRY_AGGREGATE, POOL_FN_INPUT_TYPES, POOL_FN_OUTPUT_TYPES
+)
 from src.uniswap import UniswapV3Calculator, Position
 from src.analysis import PositionAnalyzer
+from tests.helpers import CloseAssertMixin
+
+
+POOL_ADDRESS = "0x88e6A0c2dDD26FEEb64F039a2c41296FcB3f5640"
+
+# ticks() result of a tick no position references
+UNINITIALIZED_TICK = (0, 0, 0, 0, 0, 0, 0, False)
+
+
+def _mock_pool_reads(fetcher, tick_spacing, slot0, liquidity, tick_data):
+    """Serve the fetcher's pool reads from fixed values.
+    
+    Single pool calls are answered by name; tick reads arrive as one
+    Multicall3 tryAggregate eth_call, answered per tick from tick_data.
+    """
+    pool_values = {'tickSpacing': tick_spacing, 'slot0': slot0, 'liquidity': liquidity}
+    
+    async def call_pool_function(address, name, *args, block_identifier='latest'):
+        return pool_values[name]
+    
+    async def eth_call(transaction, block_identifier):
+        assert transaction['to'] == MULTICALL3_ADDRESS
+        assert transaction['data'][:4] == MULTICALL3_TRY_AGGREGATE
+        _, calls = decode(['bool', '(address,bytes)[]'], transaction['data'][4:])
+        results = []
+        for _, call_data in calls:
+            (tick,) = decode(POOL_FN_INPUT_TYPES['ticks'], call_data[4:])
+            data = tick_data.get(tick, UNINITIALIZED_TICK)
+            results.append((True, encode(POOL_FN_OUTPUT_TYPES['ticks'], data)))
+        return encode(['(bool,bytes)[]'], [results])
+    
+    fetcher._connected = True
+    fetcher._call_pool_function = call_pool_function
+    fetcher.w3.eth.call = eth_call
 
 
 class TestLiquidityDistributionScenarios(unittest.TestCase):
@@ -20,16 +59,8 @@ class TestLiquidityDistributionScenarios(unittest.TestCase):
     def setUp(self):
         self.data_fetcher = DataFetcher("http://mock-rpc", cache=None)
     
-    @patch('src.blockchain.data_fetcher.Web3')
-    async def test_negative_liquidity_net_accumulation(self, mock_web3):
+    def test_negative_liquidity_net_accumulation(self):
         """Test handling of multiple negative liquidity_net values."""
-        mock_contract = Mock()
-        mock_web3.return_value.eth.contract.return_value = mock_contract
-        
-        mock_contract.functions.tickSpacing.return_value.call.return_value = 10
-        mock_contract.functions.slot0.return_value.call.return_value = [0, 200000, 0, 0, 0, 0, True]
-        mock_contract.functions.liquidity.return_value.call.return_value = 10000000
-        
         # All negative liquidity_net values
         tick_data = {
             199980: (1000000, -1000000, 0, 0, 0, 0, 0, True),
@@ -39,37 +70,30 @@ class TestLiquidityDistributionScenarios(unittest.TestCase):
             200020: (500000, -500000, 0, 0, 0, 0, 0, True),
         }
         
-        mock_contract.functions.ticks.return_value.call.side_effect = lambda t: tick_data.get(t, (0, 0, 0, 0, 0, 0, 0, False))
+        _mock_pool_reads(self.data_fetcher, 10, (0, 200000, 0, 0, 0, 0, True), 10000000, tick_data)
         
-        distribution = await self.data_fetcher.get_liquidity_distribution(
-            "0x1234", 1000, 199970, 200030
-        )
+        distribution = asyncio.run(self.data_fetcher.get_liquidity_distribution(
+            POOL_ADDRESS, 1000, 199970, 200030
+        ))
         
         # All liquidity values should be non-negative
         for tick, liquidity in distribution.items():
             self.assertGreaterEqual(liquidity, 0)
     
-    @patch('src.blockchain.data_fetcher.Web3')
-    async def test_sparse_tick_data(self, mock_web3):
+    def test_sparse_tick_data(self):
         """Test with very sparse tick data (most ticks uninitialized)."""
-        mock_contract = Mock()
-        mock_web3.return_value.eth.contract.return_value = mock_contract
-        
-        mock_contract.functions.tickSpacing.return_value.call.return_value = 60  # Wide spacing
-        mock_contract.functions.slot0.return_value.call.return_value = [0, 200040, 0, 0, 0, 0, True]
-        mock_contract.functions.liquidity.return_value.call.return_value = 5000000
-        
         # Only 2 initialized ticks in a wide range
         tick_data = {
             199980: (100000, 100000, 0, 0, 0, 0, 0, True),
             200040: (200000, -50000, 0, 0, 0, 0, 0, True),
         }
         
-        mock_contract.functions.ticks.return_value.call.side_effect = lambda t: tick_data.get(t, (0, 0, 0, 0, 0, 0, 0, False))
+        # Wide spacing
+        _mock_pool_reads(self.data_fetcher, 60, (0, 200040, 0, 0, 0, 0, True), 5000000, tick_data)
         
-        distribution = await self.data_fetcher.get_liquidity_distribution(
-            "0x1234", 1000, 199900, 200100
-        )
+        distribution = asyncio.run(self.data_fetcher.get_liquidity_distribution(
+            POOL_ADDRESS, 1000, 199900, 200100
+        ))
         
         # Should interpolate liquidity correctly
         self.assertEqual(distribution[200040], 5000000)  # Current tick
@@ -77,35 +101,27 @@ class TestLiquidityDistributionScenarios(unittest.TestCase):
         for tick in range(199981, 200040):
             self.assertGreaterEqual(distribution[tick], 0)
     
-    @patch('src.blockchain.data_fetcher.Web3')
-    async def test_current_tick_at_boundary(self, mock_web3):
+    def test_current_tick_at_boundary(self):
         """Test when current tick is at the extreme boundary."""
-        mock_contract = Mock()
-        mock_web3.return_value.eth.contract.return_value = mock_contract
-        
-        mock_contract.functions.tickSpacing.return_value.call.return_value = 10
-        # Current tick at the lower boundary of our range
-        mock_contract.functions.slot0.return_value.call.return_value = [0, 199980, 0, 0, 0, 0, True]
-        mock_contract.functions.liquidity.return_value.call.return_value = 1000000
-        
         tick_data = {
             199980: (100000, 50000, 0, 0, 0, 0, 0, True),
             199990: (150000, -30000, 0, 0, 0, 0, 0, True),
             200000: (200000, 100000, 0, 0, 0, 0, 0, True),
         }
         
-        mock_contract.functions.ticks.return_value.call.side_effect = lambda t: tick_data.get(t, (0, 0, 0, 0, 0, 0, 0, False))
+        # Current tick at the lower boundary of our range
+        _mock_pool_reads(self.data_fetcher, 10, (0, 199980, 0, 0, 0, 0, True), 1000000, tick_data)
         
-        distribution = await self.data_fetcher.get_liquidity_distribution(
-            "0x1234", 1000, 199980, 200010
-        )
+        distribution = asyncio.run(self.data_fetcher.get_liquidity_distribution(
+            POOL_ADDRESS, 1000, 199980, 200010
+        ))
         
         # Verify correct liquidity at boundaries
         self.assertEqual(distribution[199980], 1000000)  # Current tick
         self.assertGreaterEqual(distribution[200000], 0)
 
 
-class TestFeeCalculationScenarios(unittest.TestCase):
+class TestFeeCalculationScenarios(CloseAssertMixin, unittest.IsolatedAsyncioTestCase):
     """Test various fee calculation scenarios."""
     
     def setUp(self):
@@ -123,7 +139,7 @@ class TestFeeCalculationScenarios(unittest.TestCase):
         )
         
         # Position has all the liquidity
-        liquidity_distribution = {tick: 10000000 for tick in range(50, 250)}
+        liquidity_distribution = dict.fromkeys(range(50, 250), 10000000)
         
         swap_events = [
             SwapEvent(
@@ -146,7 +162,7 @@ class TestFeeCalculationScenarios(unittest.TestCase):
         # Should get 100% of fees
         total_usdc_fees = sum(fees[0] for fees in fee_by_tick.values())
         expected_fees = 10000 * 0.003  # 30 USDC
-        self.assertAlmostEqual(total_usdc_fees, expected_fees, places=2)
+        self._close(total_usdc_fees, expected_fees)
     
     async def test_swap_entirely_outside_range(self):
         """Test when swap occurs entirely outside position range."""
@@ -158,7 +174,7 @@ class TestFeeCalculationScenarios(unittest.TestCase):
             amount1=5
         )
         
-        liquidity_distribution = {tick: 10000000 for tick in range(0, 300)}
+        liquidity_distribution = dict.fromkeys(range(0, 300), 10000000)
         
         # Swap from tick 250 to 280 (outside our 100-200 range)
         swap_events = [
@@ -201,8 +217,19 @@ class TestFeeCalculationScenarios(unittest.TestCase):
             distance_from_200 = abs(tick - 200)
             liquidity_distribution[tick] = max(1000000, 10000000 - distance_from_200 * 50000)
         
-        # Large swap crossing 100 ticks
+        # Large swap crossing 100 ticks, from the tick of a small swap before it
         swap_events = [
+            SwapEvent(
+                sender="0x1",
+                recipient="0x2",
+                amount0=-1000000,  # 1 USDC
+                amount1=500000000000000,  # 0.0005 ETH
+                sqrt_price_x96=0,
+                liquidity=0,
+                tick=150,  # Start tick
+                block_number=1,
+                transaction_hash="0xabc"
+            ),
             SwapEvent(
                 sender="0x1",
                 recipient="0x2",
@@ -211,8 +238,8 @@ class TestFeeCalculationScenarios(unittest.TestCase):
                 sqrt_price_x96=0,
                 liquidity=0,
                 tick=250,  # End tick
-                block_number=1,
-                transaction_hash="0xabc"
+                block_number=2,
+                transaction_hash="0xdef"
             )
         ]
         
@@ -234,7 +261,7 @@ class TestFeeCalculationScenarios(unittest.TestCase):
             amount1=5
         )
         
-        liquidity_distribution = {tick: 10000000 for tick in range(50, 250)}
+        liquidity_distribution = dict.fromkeys(range(50, 250), 10000000)
         
         swap_events = [
             # Buy ETH (negative USDC, positive ETH)
@@ -499,7 +526,7 @@ class TestPositionCalculationScenarios(unittest.TestCase):
         self.assertGreater(position2.liquidity, 0)
 
 
-class TestEdgeCasesAndBoundaries(unittest.TestCase):
+class TestEdgeCasesAndBoundaries(unittest.IsolatedAsyncioTestCase):
     """Test edge cases and boundary conditions."""
     
     def setUp(self):
@@ -589,7 +616,7 @@ class TestEdgeCasesAndBoundaries(unittest.TestCase):
             amount1=5
         )
         
-        liquidity_distribution = {tick: 10000000 for tick in range(50, 250)}
+        liquidity_distribution = dict.fromkeys(range(50, 250), 10000000)
         swap_events = []  # No swaps
         
         fee_by_tick = await self.analyzer.estimate_fees_from_swaps(
@@ -601,7 +628,7 @@ class TestEdgeCasesAndBoundaries(unittest.TestCase):
         self.assertEqual(total_fees, 0)
 
 
-class TestRealWorldScenarios(unittest.TestCase):
+class TestRealWorldScenarios(unittest.IsolatedAsyncioTestCase):
     """Test scenarios based on real-world conditions."""
     
     def setUp(self):
@@ -618,7 +645,7 @@ class TestRealWorldScenarios(unittest.TestCase):
             amount1=25
         )
         
-        liquidity_distribution = {tick: 50000000 for tick in range(198000, 202000)}
+        liquidity_distribution = dict.fromkeys(range(198000, 202000), 50000000)
         
         # Simulate rapid price swings
         swap_events = []
@@ -720,6 +747,42 @@ class TestRealWorldScenarios(unittest.TestCase):
         self.assertGreater(position_ratio, 0.99)  # Should have >99% of pool
 
 
+class TestSwapEventTable(unittest.TestCase):
+    """Test the column-oriented swap events layout."""
+    
+    def test_round_trip_preserves_events(self):
+        """Converting to a table and back should yield identical events."""
+        swap_events = [
+            SwapEvent(
+                sender="0x1",
+                recipient="0x2",
+                amount0=-(10**30),  # Larger than int64
+                amount1=5 * 10**18,
+                sqrt_price_x96=2**159,
+                liquidity=2**127,
+                tick=200550 + i,
+                block_number=17618642 + i,
+                transaction_hash=f"0x{i:064x}"
+            )
+            for i in range(3)
+        ]
+        
+        table = swap_events_to_frame(swap_events)
+        
+        self.assertEqual(tuple(table.columns), SWAP_EVENT_COLUMNS)
+        self.assertEqual(table['tick'].dtype, np.int64)
+        self.assertEqual(table['amount0'].iloc[0], -(10**30))
+        self.assertEqual(frame_to_swap_events(table), swap_events)
+    
+    def test_empty_events(self):
+        """An empty event list should give an empty table with all columns."""
+        table = swap_events_to_frame([])
+        
+        self.assertTrue(table.empty)
+        self.assertEqual(tuple(table.columns), SWAP_EVENT_COLUMNS)
+        self.assertEqual(frame_to_swap_events(table), [])
+
+
 def run_scenario_tests():
     """Run all scenario tests with proper async handling."""
     import sys
@@ -735,7 +798,8 @@ def run_scenario_tests():
         TestImpermanentLossScenarios,
         TestPositionCalculationScenarios,
         TestEdgeCasesAndBoundaries,
-        TestRealWorldScenarios
+        TestRealWorldScenarios,
+        TestSwapEventTable
     ]
     
     for test_class in test_classes:
@@ -0,0 +1,145 @@
+"""
+Unit tests for configuration loading.
+"""
+
+import unittest
+import tempfile
+import yaml
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import config_manager
+from src.config.config_manager import ConfigManager
+
+
+CONFIG_YAML = """
+ethereum:
+  rpc_url: "https://rpc.example/${TEST_RPC_KEY}"
+
+pools:
+  usdc_eth_030:
+    address: "0x8ad599c3A0ff1De082011EFDDc58f1908eb6e6D8"
+    name: "USDC/ETH 0.3%"
+    fee_tier: 3000
+    token0:
+      address: "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+      symbol: "USDC"
+      decimals: 6
+    token1:
+      address: "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+      symbol: "WETH"
+      decimals: 18
+
+analysis:
+  default:
+    start_block: 17618642
+    end_block: 17818642
+    initial_portfolio_value: 100000
+    portfolio_split: 0.5
+    position:
+      tick_lower: 200540
+      tick_upper: 200560
+
+output:
+  formats: ["html", "$literal"]
+"""
+
+
+class TestConfigManager(unittest.TestCase):
+    """Test cases for ConfigManager."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(self.config_path, 'w') as f:
+            f.write(CONFIG_YAML)
+
+    def tearDown(self):
+        """Remove the config directory."""
+        self.temp_dir.cleanup()
+
+    def test_load_substitutes_env_vars(self):
+        """Test that ${VAR} references are replaced from the environment."""
+        with patch.dict(os.environ, {'TEST_RPC_KEY': 'secret'}):
+            config = ConfigManager(self.config_path).load()
+
+        self.assertEqual(config.ethereum.rpc_url, "https://rpc.example/secret")
+        self.assertEqual(config.output.formats, ["html", "$literal"])
+        self.assertEqual(config.pools['usdc_eth_030'].token1.symbol, "WETH")
+        self.assertEqual(config.analysis['default'].position.tick_upper, 200560)
+
+    def test_missing_env_var(self):
+        """Test that an unset environment variable is reported."""
+        with patch.dict(os.environ, {}, clear=True):
+            with self.assertRaises(ValueError):
+                ConfigManager(self.config_path).load()
+
+    def test_load_is_cached_until_file_changes(self):
+        """Test that unchanged files are parsed once and edits are picked up."""
+        with patch.dict(os.environ, {'TEST_RPC_KEY': 'secret'}):
+            first = ConfigManager(self.config_path).load()
+            second = ConfigManager(self.config_path).load()
+
+            st = os.stat(self.config_path)
+            os.utime(self.config_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            reloaded = ConfigManager(self.config_path).load()
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, reloaded)
+        self.assertEqual(first, reloaded)
+
+    def test_config_lookups(self):
+        """Test pool lookup and KeyError for unknown pool/analysis ids."""
+        with patch.dict(os.environ, {'TEST_RPC_KEY': 'secret'}):
+            manager = ConfigManager(self.config_path)
+            self.assertEqual(manager.get_pool_config("usdc_eth_030").fee_tier, 3000)
+            with self.assertRaisesRegex(KeyError, "Pool 'missing' not found"):
+                manager.get_pool_config("missing")
+            with self.assertRaisesRegex(KeyError, "Analysis config 'missing' not found"):
+                manager.get_analysis_config("missing")
+
+    def test_parsers_agree_on_configs(self):
+        """Test that the msgspec and fallback parsers accept and reject the same configs."""
+        parsers = [None] + ([config_manager.msgspec] if config_manager.msgspec else [])
+
+        def edited(edit):
+            data = yaml.safe_load(CONFIG_YAML)
+            edit(data)
+            return data
+
+        # Extra keys are ignored at every level
+        valid = {
+            'unknown section': edited(lambda d: d.update(outputs={})),
+            'unknown token key': edited(lambda d: d['pools']['usdc_eth_030']['token0'].update(decimal=6)),
+            'unknown position key': edited(lambda d: d['analysis']['default']['position'].update(width=20)),
+            'int as float': edited(lambda d: d['analysis']['default'].update(portfolio_split=1)),
+        }
+        invalid = {
+            'missing key': edited(lambda d: d['pools']['usdc_eth_030']['token1'].pop('decimals')),
+            'missing section': edited(lambda d: d.pop('ethereum')),
+            'not a mapping': edited(lambda d: d['analysis'].update(default=[])),
+            'string as int': edited(lambda d: d.update(performance={'max_workers': "20"})),
+            'bool as int': edited(lambda d: d['pools']['usdc_eth_030'].update(fee_tier=True)),
+            'string as list': edited(lambda d: d['output'].update(formats="html")),
+        }
+
+        for parser in parsers:
+            with patch.object(config_manager, 'msgspec', parser):
+                expected = ConfigManager._parse_config(yaml.safe_load(CONFIG_YAML))
+                for name, data in valid.items():
+                    with self.subTest(parser=parser and 'msgspec', case=name):
+                        config = ConfigManager._parse_config(data)
+                        self.assertEqual(config.pools, expected.pools)
+                        self.assertEqual(config.output, expected.output)
+                for name, data in invalid.items():
+                    with self.subTest(parser=parser and 'msgspec', case=name):
+                        with self.assertRaises(ValueError):
+                            ConfigManager._parse_config(data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,18 +5,20 @@ Tests all core calculations to ensure correctness and prevent issues like negati
 
 import unittest
 import asyncio
+from collections.abc import Mapping
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 import numpy as np
 
 from src.uniswap import UniswapV3Calculator, Position
 from src.analysis import PositionAnalyzer
 from src.blockchain import PoolState, SwapEvent
+from tests.helpers import CloseAssertMixin
 
 
 class TestLiquidityDistribution(unittest.TestCase):
     """Test liquidity distribution calculations."""
     
-    @patch('src.blockchain.data_fetcher.Web3')
+    @patch('src.blockchain.data_fetcher.AsyncWeb3')
     async def test_liquidity_never_negative(self, mock_web3_class):
         """Liquidity should never be negative."""
         from src.blockchain import DataFetcher
@@ -87,7 +89,7 @@ class TestLiquidityDistribution(unittest.TestCase):
         self.assertEqual(aligned_upper, 200020)
 
 
-class TestFeeCalculations(unittest.TestCase):
+class TestFeeCalculations(CloseAssertMixin, unittest.TestCase):
     """Test fee calculation logic."""
     
     def setUp(self):
@@ -105,7 +107,7 @@ class TestFeeCalculations(unittest.TestCase):
         )
         
         # Mock liquidity distribution - our position has 10% of pool
-        liquidity_distribution = {tick: 10000000 for tick in range(90, 120)}
+        liquidity_distribution = dict.fromkeys(range(90, 120), 10000000)
         
         swap_events = [
             SwapEvent(
@@ -135,7 +137,7 @@ class TestFeeCalculations(unittest.TestCase):
         # Distributed across 6 ticks (100-105) = 0.05/6 ≈ 0.00833 USDC per tick
         
         total_usdc_fees = sum(fees[0] for fees in fee_by_tick.values())
-        self.assertAlmostEqual(total_usdc_fees, 0.05, places=4)
+        self._close(total_usdc_fees, 0.05)
         
         # Verify no fees outside position range
         for tick, fees in fee_by_tick.items():
@@ -182,7 +184,7 @@ class TestFeeCalculations(unittest.TestCase):
         fee_by_tick = asyncio.run(run_test())
         
         # Verify it handled zero liquidity gracefully
-        self.assertIsInstance(fee_by_tick, dict)
+        self.assertIsInstance(fee_by_tick, Mapping)
 
 
 class TestImpermanentLoss(unittest.TestCase):
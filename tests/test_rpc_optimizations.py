@@ -12,6 +12,7 @@ load_dotenv()
 # Import optimized components
 from src.blockchain import DataFetcher
 from src.config import ConfigManager
+from src.data.cache import FileCache
 
 # Test constants
 TEST_POOL = "0x88e6A0c2dDD26FEEb64F039a2c41296FcB3f5640"  # USDC/WETH pool
@@ -51,25 +52,28 @@ async def test_data_fetcher_init(config):
         return None
     
     try:
+        # Historical pool states and swap logs are immutable, so a disk cache
+        # keyed on (pool, block) serves reruns without touching the node
+        cache = FileCache(config.cache.directory, default_ttl=config.cache.ttl) if config.cache.enabled else None
+        
         # Create optimized data fetcher
         data_fetcher = DataFetcher(
             rpc_url=rpc_url,
             max_workers=config.performance.max_workers,
-            max_concurrent_requests=config.performance.max_concurrent_requests
+            max_concurrent_requests=config.performance.max_concurrent_requests,
+            cache=cache
         )
         
         print("✅ DataFetcher created successfully")
-        print(f"   Thread pool workers: {data_fetcher.executor._max_workers}")
-        print(f"   Rate limit semaphore: {data_fetcher.semaphore._value}")
+        print(f"   Cache: {config.cache.directory if cache else 'disabled'}")
+        print(f"   HTTP connection pool size: {data_fetcher.w3.provider.pool_size}")
+        print(f"   Connections per host: {data_fetcher.w3.provider.max_connections_per_host}")
         
         # Test connection
-        if data_fetcher.w3.is_connected():
-            print("✅ Web3 connection established")
-            latest_block = data_fetcher.w3.eth.block_number
-            print(f"   Latest block: {latest_block}")
-        else:
-            print("❌ Web3 connection failed")
-            return None
+        await data_fetcher.connect()
+        print("✅ Web3 connection established")
+        latest_block = await data_fetcher.w3.eth.block_number
+        print(f"   Latest block: {latest_block}")
             
         return data_fetcher
     except Exception as e:
@@ -103,25 +107,19 @@ async def test_parallel_fetching(data_fetcher):
     print("\n⚡ Testing Parallel Fetching...")
     
     try:
-        # Test fetching multiple blocks in parallel
-        blocks_to_test = [TEST_BLOCK + i for i in range(5)]
+        # Fetch pool states for several blocks; the pool calls for all
+        # blocks go to the node as one JSON-RPC batch
+        blocks_to_test = list(range(TEST_BLOCK, TEST_BLOCK + 5))
         
         start_time = time.time()
-        tasks = [
-            data_fetcher.get_pool_state(TEST_POOL, block)
-            for block in blocks_to_test
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await data_fetcher.get_pool_states(TEST_POOL, blocks_to_test)
         elapsed = time.time() - start_time
         
-        successful = sum(1 for r in results if not isinstance(r, Exception))
-        print(f"✅ Fetched {successful}/{len(blocks_to_test)} pool states in {elapsed:.2f}s")
-        print(f"   Average time per request: {elapsed/len(blocks_to_test):.2f}s")
+        print(f"✅ Fetched {len(results)}/{len(blocks_to_test)} pool states in {elapsed:.2f}s")
+        print(f"   Average time per block: {elapsed/len(blocks_to_test):.2f}s")
         
         # Check rate limiting is working
-        if hasattr(data_fetcher.semaphore, '_value'):
-            print(f"✅ Rate limiting is active (current permits: {data_fetcher.semaphore._value})")
+        print(f"✅ Rate limiting is active (max connections per host: {data_fetcher.w3.provider.max_connections_per_host})")
         
         return True
     except Exception as e:
@@ -162,21 +160,33 @@ async def test_connection_pooling(data_fetcher):
     print("\n🔄 Testing Connection Pooling...")
     
     try:
-        # Make multiple rapid requests to test connection reuse
         num_requests = 10
         
+        # Concurrent requests share the pooled connections
         start_time = time.time()
-        for i in range(num_requests):
-            await data_fetcher._rate_limited_call(
-                lambda: data_fetcher.w3.eth.get_block('latest')
-            )
+        await asyncio.gather(*[
+            data_fetcher._rate_limited_call(data_fetcher.w3.eth.get_block, 'latest')
+            for _ in range(num_requests)
+        ])
         elapsed = time.time() - start_time
         
         avg_time = elapsed / num_requests
-        print(f"✅ Completed {num_requests} requests in {elapsed:.2f}s")
+        print(f"✅ Completed {num_requests} concurrent requests in {elapsed:.2f}s")
         print(f"   Average time per request: {avg_time:.3f}s")
         print(f"   Connection pooling is {'efficient' if avg_time < 0.5 else 'working'}")
         
+        # The same requests as one JSON-RPC batch over a single round trip
+        calls = [('eth_getBlockByNumber', ['latest', False])] * num_requests
+        
+        start_time = time.time()
+        responses = await data_fetcher._rate_limited_call(
+            data_fetcher.w3.provider.make_batch_request, calls
+        )
+        elapsed = time.time() - start_time
+        
+        successful = sum(1 for r in responses if 'result' in r)
+        print(f"✅ Completed {successful}/{num_requests} requests in one batch in {elapsed:.2f}s")
+        
         return True
     except Exception as e:
         print(f"❌ Connection pooling test failed: {e}")
@@ -213,6 +223,8 @@ async def main():
     # Test 6: Connection pooling
     await test_connection_pooling(data_fetcher)
     
+    await data_fetcher.close()
+    
     print("\n" + "=" * 60)
     print("✅ All tests completed!")
     print("=" * 60)